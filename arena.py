@@ -0,0 +1,238 @@
+"""
+A headless arena, which plays many games between two strategies without
+asking for input or printing each move, spread over a pool of processes,
+and records how each game went.
+
+Games and strategies are named by their keys in game_interface, e.g. to
+play 1000 games of Stonehenge with side length 2 between alpha-beta and
+Monte Carlo Tree Search:
+
+    python arena.py h ab mc --games 1000 --side-length 2
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+from game_interface import playable_games, usable_strategies, \
+    unusable_strategies
+from strategy import SearchStats
+
+# The parameters each game is created with in the arena, and their default
+# values, so that no game asks for them with input().
+GAME_PARAMETERS = {'s': {'count': 20}, 'h': {'side_length': 2}, 'c': {}}
+
+# The strategies which ask for input(), and so cannot play in the arena.
+INTERACTIVE_STRATEGIES = {'i'}
+
+
+class GameRecord:
+    """
+    A record of one game played in the arena.
+
+    number - the number of this game in its match, counting from 0
+    p1_started - whether p1 made the first move
+    winner - 'p1' or 'p2', or None if the game was stopped unfinished
+    players - the player who made each move
+    moves - each move made, as a string
+    latencies - the seconds taken to choose each move
+    nodes - the number of states searched to choose each move
+    """
+    number: int
+    p1_started: bool
+    winner: Optional[str]
+    players: List[str]
+    moves: List[str]
+    latencies: List[float]
+    nodes: List[int]
+
+    def __init__(self, number: int, p1_started: bool) -> None:
+        """
+        Initialize a record of game number number, with no moves made yet.
+        """
+        self.number = number
+        self.p1_started = p1_started
+        self.winner = None
+        self.players = []
+        self.moves = []
+        self.latencies = []
+        self.nodes = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return this record as a dictionary which can be written as JSON.
+        """
+        return {'number': self.number, 'p1_started': self.p1_started,
+                'winner': self.winner, 'players': self.players,
+                'moves': self.moves, 'latencies': self.latencies,
+                'nodes': self.nodes}
+
+
+def play_game(game_key: str, p1_key: str, p2_key: str,
+              game_params: Dict[str, Any], p1_starts: bool, number: int = 0,
+              max_moves: int = 1000) -> GameRecord:
+    """
+    Return the record of a game of playable_games[game_key], created with
+    game_params, between the strategies usable_strategies[p1_key] and
+    usable_strategies[p2_key].
+
+    A player whose strategy returns an invalid move loses. A game still
+    going after max_moves moves (e.g. Chopsticks played in circles) is
+    stopped with no winner.
+
+    >>> record = play_game('s', 'mr', 'mr', {'count': 20}, True)
+    >>> record.winner, record.players[:2]
+    ('p2', ['p1', 'p2'])
+    """
+    game = playable_games[game_key](p1_starts, **game_params)
+    strategies = {'p1': usable_strategies[p1_key],
+                  'p2': usable_strategies[p2_key]}
+    record = GameRecord(number, p1_starts)
+    state = game.current_state
+    while not game.is_over(state):
+        if len(record.moves) >= max_moves:
+            return record
+        player = state.get_current_player_name()
+        stats = SearchStats()
+        start = perf_counter()
+        move = strategies[player](game, stats=stats)
+        record.latencies.append(perf_counter() - start)
+        record.players.append(player)
+        record.moves.append(str(move))
+        record.nodes.append(stats.nodes)
+        if not state.is_valid_move(move):
+            record.winner = 'p2' if player == 'p1' else 'p1'
+            return record
+        state = state.make_move(move)
+        game.current_state = state
+
+    if game.is_winner('p1'):
+        record.winner = 'p1'
+    elif game.is_winner('p2'):
+        record.winner = 'p2'
+    return record
+
+
+def _play_numbered_game(args: tuple) -> GameRecord:
+    """
+    Return play_game(*args), so that games can be mapped over a process
+    pool.
+    """
+    return play_game(*args)
+
+
+def play_match(game_key: str, p1_key: str, p2_key: str, games: int,
+               game_params: Optional[Dict[str, Any]] = None,
+               workers: Optional[int] = None,
+               max_moves: int = 1000) -> List[GameRecord]:
+    """
+    Return the records of games games of playable_games[game_key] between
+    usable_strategies[p1_key] and usable_strategies[p2_key], with p1 and p2
+    taking turns to move first.
+
+    The games are played across at most workers processes (one per core by
+    default), or in this process if workers is 1.
+    """
+    if game_params is None:
+        game_params = {}
+    args = [(game_key, p1_key, p2_key, game_params, number % 2 == 0, number,
+             max_moves) for number in range(games)]
+    if workers == 1:
+        return [_play_numbered_game(game_args) for game_args in args]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(_play_numbered_game, args,
+                                 chunksize=max(1, games // (4 * workers))))
+
+
+def summarize(records: List[GameRecord]) -> Dict[str, Any]:
+    """
+    Return the number of games each player won or left unfinished in
+    records, and for each player, the number of moves they made, the mean
+    and longest time they took to choose a move, and the states searched.
+
+    >>> record = GameRecord(0, True)
+    >>> record.winner = 'p1'
+    >>> summary = summarize([record])
+    >>> summary['p1_wins'], summary['p2_wins'], summary['unfinished']
+    (1, 0, 0)
+    """
+    summary = {'games': len(records),
+               'p1_wins': sum(record.winner == 'p1' for record in records),
+               'p2_wins': sum(record.winner == 'p2' for record in records),
+               'unfinished': sum(record.winner is None for record in records)}
+    for player in ['p1', 'p2']:
+        latencies = []
+        nodes = 0
+        for record in records:
+            for mover, latency, searched in zip(
+                    record.players, record.latencies, record.nodes):
+                if mover == player:
+                    latencies.append(latency)
+                    nodes += searched
+        total_time = sum(latencies)
+        summary[player] = {
+            'moves': len(latencies),
+            'mean_latency': total_time / len(latencies) if latencies else 0.0,
+            'max_latency': max(latencies, default=0.0),
+            'nodes': nodes,
+            'nodes_per_second': nodes / total_time if total_time else 0.0}
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Play a match described by the command line arguments argv, print its
+    summary as JSON, and write the record of each game as a line of JSON to
+    the output file, if one is given.
+    """
+    parser = argparse.ArgumentParser(
+        description="Play games between two strategies without input.")
+    strategies = sorted(set(usable_strategies) - INTERACTIVE_STRATEGIES)
+    parser.add_argument('game', choices=sorted(playable_games))
+    parser.add_argument('p1', choices=strategies)
+    parser.add_argument('p2', choices=strategies)
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-moves', type=int, default=1000)
+    parser.add_argument('--side-length', type=int, default=None,
+                        help="the side length of a Stonehenge board "
+                             "(default: {})".format(
+                                 GAME_PARAMETERS['h']['side_length']))
+    parser.add_argument('--count', type=int, default=None,
+                        help="the number to subtract from in Subtract Square "
+                             "(default: {})".format(
+                                 GAME_PARAMETERS['s']['count']))
+    parser.add_argument('--output', default=None,
+                        help="a file to write each game's record to")
+    args = parser.parse_args(argv)
+    for key in [args.p1, args.p2]:
+        if key in unusable_strategies.get(args.game, set()):
+            parser.error("strategy '{}' cannot play game '{}'".format(
+                key, args.game))
+
+    game_params = dict(GAME_PARAMETERS.get(args.game, {}))
+    for name, option, minimum in [('side_length', '--side-length', 1),
+                                  ('count', '--count', 0)]:
+        value = getattr(args, name)
+        if value is None:
+            continue
+        if name not in game_params:
+            parser.error("{} does not apply to game '{}'".format(
+                option, args.game))
+        if value < minimum:
+            parser.error("{} must be at least {}".format(option, minimum))
+        game_params[name] = value
+    records = play_match(args.game, args.p1, args.p2, args.games,
+                         game_params, args.workers, args.max_moves)
+    if args.output is not None:
+        with open(args.output, 'w') as output:
+            for record in records:
+                output.write(json.dumps(record.to_dict()) + '\n')
+    print(json.dumps(summarize(records), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from arena import play_game, play_match, summarize, main
+
+
+class ArenaUnitTests(unittest.TestCase):
+    @patch('builtins.input', side_effect=AssertionError("input() called"))
+    def test_play_game_no_input(self, input):
+        """
+        Test that a game of Stonehenge is played to the end without asking
+        for input, recording every move.
+        """
+        record = play_game('h', 'ab', 'ro', {'side_length': 2}, True)
+        self.assertIn(record.winner, ['p1', 'p2'])
+        self.assertEqual(record.players[0], 'p1')
+        self.assertEqual(len(record.moves), len(record.latencies))
+        self.assertEqual(len(record.moves), len(record.nodes))
+        self.assertTrue(all(nodes > 0 for nodes in record.nodes))
+
+    def test_play_match_alternates_first_player(self):
+        """
+        Test that players take turns moving first, and that perfect play of
+        Subtract Square from 20 is won by whoever moves second.
+        """
+        records = play_match('s', 'ab', 'mr', 4, {'count': 20}, workers=1)
+        self.assertEqual([record.p1_started for record in records],
+                         [True, False, True, False])
+        self.assertEqual([record.winner for record in records],
+                         ['p2', 'p1', 'p2', 'p1'])
+        summary = summarize(records)
+        self.assertEqual((summary['p1_wins'], summary['p2_wins']), (2, 2))
+        self.assertEqual(summary['p1']['moves'] + summary['p2']['moves'],
+                         sum(len(record.moves) for record in records))
+
+    def test_play_match_process_pool(self):
+        """
+        Test that games played across processes give the same results as
+        games played in this process.
+        """
+        local = play_match('h', 'ab', 'mr', 4, {'side_length': 2}, workers=1)
+        pooled = play_match('h', 'ab', 'mr', 4, {'side_length': 2}, workers=2)
+        self.assertEqual([record.moves for record in local],
+                         [record.moves for record in pooled])
+
+    def test_play_game_max_moves(self):
+        """
+        Test that a game still going after max_moves moves is stopped with no
+        winner.
+        """
+        record = play_game('s', 'mr', 'mr', {'count': 30}, True, max_moves=2)
+        self.assertIsNone(record.winner)
+        self.assertEqual(len(record.moves), 2)
+
+    def test_main_writes_records(self):
+        """
+        Test that the command line writes one line of JSON per game and
+        prints a summary.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.jsonl')
+            output = StringIO()
+            with redirect_stdout(output):
+                main(['s', 'mr', 'ab', '--games', '3', '--count', '10',
+                      '--workers', '1', '--output', path])
+            with open(path) as records:
+                lines = [json.loads(line) for line in records]
+        self.assertEqual([line['number'] for line in lines], [0, 1, 2])
+        self.assertEqual(json.loads(output.getvalue())['games'], 3)
+
+    def test_chopsticks_match(self):
+        """
+        Test that games of Chopsticks between the strategies which can play
+        it finish.
+        """
+        records = play_match('c', 'ct', 'ro', 2, {}, workers=1)
+        self.assertEqual(len(records), 2)
+        records = play_match('c', 'id', 'mc', 2, {}, workers=1,
+                             max_moves=10)
+        self.assertEqual(len(records), 2)
+
+    def test_main_rejects_unusable_strategy(self):
+        """
+        Test that the command line refuses to play Chopsticks with a
+        strategy which cannot finish searching it.
+        """
+        with patch('sys.stderr', StringIO()) as error:
+            with self.assertRaises(SystemExit):
+                main(['c', 'ct', 'ab', '--games', '1'])
+        self.assertIn("strategy 'ab' cannot play game 'c'", error.getvalue())
+
+    @patch('builtins.input', side_effect=AssertionError("input() called"))
+    def test_main_default_game_parameters(self, input):
+        """
+        Test that the command line plays games whose parameters are not
+        given with their defaults, instead of asking for them.
+        """
+        for game_key in ['s', 'h', 'c']:
+            output = StringIO()
+            with redirect_stdout(output):
+                main([game_key, 'ro', 'ro', '--games', '2', '--workers', '1',
+                      '--max-moves', '20'])
+            self.assertEqual(json.loads(output.getvalue())['games'], 2)
+
+    def test_main_rejects_invalid_arguments(self):
+        """
+        Test that the command line refuses parameters which do not apply to
+        the game or are out of range, and the interactive strategy.
+        """
+        for argv, message in [
+                (['c', 'ro', 'ro', '--count', '5'],
+                 "--count does not apply to game 'c'"),
+                (['h', 'ro', 'ro', '--count', '5'],
+                 "--count does not apply to game 'h'"),
+                (['s', 'ro', 'ro', '--side-length', '2'],
+                 "--side-length does not apply to game 's'"),
+                (['h', 'ro', 'ro', '--side-length', '0'],
+                 "--side-length must be at least 1"),
+                (['s', 'i', 'ro'], "invalid choice: 'i'")]:
+            with patch('sys.stderr', StringIO()) as error:
+                with self.assertRaises(SystemExit):
+                    main(argv)
+            self.assertIn(message, error.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,8 @@
+"""
+Benchmarks of the game state primitives and strategies, on fixed positions
+of each game, with baselines to catch regressions.
+
+Run them from the directory holding the games with:
+
+    python -m benchmarks
+"""
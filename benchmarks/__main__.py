@@ -0,0 +1,61 @@
+"""
+Run the benchmarks, print their times next to the baseline's, and exit with
+status 1 if any of them regressed past the threshold.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+from benchmarks.suite import run, compare, load_baseline, save_baseline
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmarks as the command line arguments argv describe, and
+    return the exit status: 1 if any regressed, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Time game state primitives and strategies.")
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help="the JSON file of baseline results")
+    parser.add_argument('--save', action='store_true',
+                        help="save the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="the fraction slower than the baseline a "
+                             "benchmark may be before it has regressed")
+    parser.add_argument('--filter', default='',
+                        help="only run benchmarks whose names contain this")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat)
+    baseline = load_baseline(args.baseline) or {}
+    regressions = compare(results, baseline, args.threshold)
+    for name, result in results.items():
+        line = '{:<50} {:>12.6f}s'.format(name, result['seconds'])
+        if name in baseline:
+            line += ' {:>+8.1%}'.format(
+                result['seconds'] / baseline[name]['seconds'] - 1)
+        if 'nodes' in result:
+            line += ' {:>10} nodes'.format(result['nodes'])
+        if 'first_move_cutoff_rate' in result:
+            line += ' {:>5.0%} first-move cutoffs'.format(
+                result['first_move_cutoff_rate'])
+        if 'bytes_per_state' in result:
+            line += ' {:>6.0f} B/state {:>6.0f} B/node'.format(
+                result['bytes_per_state'], result['bytes_per_node'])
+        if name in regressions:
+            line += '  REGRESSED'
+        print(line)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
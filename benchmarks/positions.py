@@ -0,0 +1,40 @@
+"""
+The fixed positions the benchmarks are run on.
+"""
+from typing import Any, Callable, Dict, List
+from chopsticks import Chopsticks
+from stonehenge import StonehengeGame
+from subtract_square_game import SubtractSquareGame
+
+# The moves which lead to the Stonehenge board STONEHENGE_MINIMAX_BOARD in
+# minimax_unittest_basic.py, on a board of side length 3 where p2 starts.
+STONEHENGE_MINIMAX_MOVES = ['K', 'A', 'C', 'B', 'F', 'E', 'G', 'D', 'I']
+
+
+def play(game: Any, moves: List[str]) -> Any:
+    """
+    Return game after making each of moves from its current state.
+    """
+    for move in moves:
+        game.current_state = game.current_state.make_move(
+            game.str_to_move(move))
+    return game
+
+
+# Functions creating a new game at each position, by name.
+POSITIONS: Dict[str, Callable[[], Any]] = {
+    'subtract_square_18': lambda: SubtractSquareGame(True, 18),
+    'subtract_square_1000003': lambda: SubtractSquareGame(True, 1000003),
+    'stonehenge_2_after_a_f_d':
+        lambda: play(StonehengeGame(True, 2), ['A', 'F', 'D']),
+    'stonehenge_minimax_board':
+        lambda: play(StonehengeGame(False, 3), STONEHENGE_MINIMAX_MOVES),
+    'stonehenge_3_after_a_b_c_d':
+        lambda: play(StonehengeGame(True, 3), ['A', 'B', 'C', 'D']),
+    'stonehenge_5_empty': lambda: StonehengeGame(True, 5),
+    'chopsticks_start': lambda: Chopsticks(True),
+}
+
+# The positions which minimax solves quickly enough to be benchmarked.
+SEARCHED_POSITIONS = ['subtract_square_18', 'stonehenge_2_after_a_f_d',
+                      'stonehenge_minimax_board', 'stonehenge_3_after_a_b_c_d']
@@ -0,0 +1,212 @@
+"""
+The benchmarks, and functions to time them and compare their times with a
+baseline.
+"""
+import json
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from strategy import recursive_minimax_strategy, iterative_minimax_strategy, \
+    alpha_beta_strategy, proof_number_strategy, MoveOrdering, \
+    PotentialState, SearchStats, TranspositionTable
+from benchmarks.positions import POSITIONS, SEARCHED_POSITIONS
+
+
+def make_all_moves(state: Any) -> None:
+    """
+    Make each possible move from state.
+    """
+    for move in state.get_possible_moves():
+        state.make_move(move)
+
+
+def score_all_moves(state: Any) -> None:
+    """
+    Find the rough_outcome() of the state each possible move from state
+    leads to, each of which is new, so that none has been found before.
+    """
+    for move in state.get_possible_moves():
+        state.make_move(move).rough_outcome()
+
+
+def strategy_benchmark(strategy: Callable, game: Any, ordered: bool = False,
+                       **kwargs: Any) -> Callable[..., Any]:
+    """
+    Return a function which calls strategy on game, with kwargs, and a new,
+    empty transposition table (and MoveOrdering, if ordered), so that every
+    call does the whole search.
+    """
+    def benchmark(stats: Optional[SearchStats] = None) -> Any:
+        """
+        Return the move strategy picks, counting its search in stats.
+        """
+        if ordered:
+            kwargs['ordering'] = MoveOrdering()
+        return strategy(game, TranspositionTable(), stats=stats, **kwargs)
+    return benchmark
+
+
+# The strategies timed at each position in SEARCHED_POSITIONS, by name.
+STRATEGIES: Dict[str, Tuple[Callable, Dict[str, Any]]] = {
+    'recursive_minimax': (recursive_minimax_strategy, {}),
+    'iterative_minimax': (iterative_minimax_strategy, {}),
+    'recursive_minimax_in_place': (recursive_minimax_strategy,
+                                   {'in_place': True}),
+    'alpha_beta': (alpha_beta_strategy, {}),
+    'alpha_beta_ordered': (alpha_beta_strategy, {'ordered': True}),
+    'proof_number': (proof_number_strategy, {}),
+}
+
+
+def get_benchmarks() -> Dict[str, Callable[..., Any]]:
+    """
+    Return a function to time for each benchmark, by name.
+
+    Each state primitive is timed at every position, except rough_outcome()
+    for games which do not have one. rough_outcome() is timed on the states
+    after each move, as search scores them, since a state may keep its rough
+    outcome once found. Each of STRATEGIES is timed at the positions in
+    SEARCHED_POSITIONS.
+    """
+    benchmarks = {}
+    for name, make_game in POSITIONS.items():
+        game = make_game()
+        state = game.current_state
+        benchmarks[name + '.get_possible_moves'] = state.get_possible_moves
+        benchmarks[name + '.make_move'] = \
+            lambda state=state: make_all_moves(state)
+        try:
+            state.rough_outcome()
+            benchmarks[name + '.rough_outcome'] = \
+                lambda state=state: score_all_moves(state)
+        except NotImplementedError:
+            pass
+        if name in SEARCHED_POSITIONS:
+            for strategy_name, (strategy, kwargs) in STRATEGIES.items():
+                benchmarks[name + '.' + strategy_name] = strategy_benchmark(
+                    strategy, game, **kwargs)
+    return benchmarks
+
+
+def time_call(function: Callable[[], Any], repeat: int = 5,
+              min_time: float = 0.05) -> float:
+    """
+    Return the fewest seconds a call of function took, over repeat runs of
+    enough calls to take at least min_time seconds.
+
+    The fastest run is the one least slowed down by anything else running.
+    """
+    number = 1
+    while True:
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        times.append((perf_counter() - start) / number)
+    return min(times)
+
+
+def bytes_per_object(make: Callable[[int], Any], count: int = 1000) -> float:
+    """
+    Return the mean bytes allocated by make(i), for i in range(count), for
+    the object it returns and everything only that object refers to.
+
+    >>> 100 < bytes_per_object(lambda i: bytearray(100)) < 200
+    True
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [make(i) for i in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return (allocated - sys.getsizeof(objects)) / count
+
+
+def node_memory(state: Any) -> Dict[str, float]:
+    """
+    Return the mean bytes taken by each state that state.make_move() returns,
+    and by each node of iterative minimax holding one of them.
+    """
+    moves = state.get_possible_moves()
+    return {
+        'bytes_per_state': bytes_per_object(
+            lambda i: state.make_move(moves[i % len(moves)])),
+        'bytes_per_node': bytes_per_object(
+            lambda i: PotentialState(state.make_move(moves[i % len(moves)]),
+                                     depth=1))}
+
+
+def run(pattern: str = '', repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Return the results of every benchmark whose name contains pattern: the
+    seconds a call takes, for strategies, the number of states searched and
+    the fraction of cutoffs made by the first move searched, and for
+    make_move, the memory each state made and each search node holding one
+    takes.
+    """
+    positions = {name: make_game().current_state
+                 for name, make_game in POSITIONS.items()}
+    results = {}
+    for name, function in get_benchmarks().items():
+        if pattern not in name:
+            continue
+        results[name] = {'seconds': time_call(function, repeat)}
+        if name.rsplit('.', 1)[1] in STRATEGIES:
+            stats = SearchStats()
+            function(stats)
+            results[name]['nodes'] = stats.nodes
+            if stats.cutoffs:
+                results[name]['first_move_cutoff_rate'] = \
+                    stats.first_move_cutoff_rate()
+        if name.endswith('.make_move'):
+            results[name].update(
+                node_memory(positions[name[:-len('.make_move')]]))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]],
+            baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[str]:
+    """
+    Return the names of the benchmarks in results which took more than
+    1 + threshold times as long as in baseline.
+
+    >>> compare({'a': {'seconds': 1.5}, 'b': {'seconds': 1.1}},
+    ...         {'a': {'seconds': 1.0}, 'b': {'seconds': 1.0}}, 0.25)
+    ['a']
+    """
+    return [name for name in results if name in baseline and
+            results[name]['seconds'] >
+            baseline[name]['seconds'] * (1 + threshold)]
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Return the baseline results saved at path, or None if there are none.
+    """
+    try:
+        with open(path) as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Save results as the baseline at path.
+    """
+    with open(path, 'w') as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from benchmarks.__main__ import main
+from benchmarks.positions import POSITIONS
+from benchmarks.suite import node_memory
+from minimax_unittest_basic import STONEHENGE_MINIMAX_BOARD
+
+
+class BenchmarkUnitTests(unittest.TestCase):
+    def test_stonehenge_minimax_board(self):
+        """
+        Test that the stonehenge_minimax_board position is the board in
+        STONEHENGE_MINIMAX_BOARD, which is drawn without the indentation of
+        the board's string.
+        """
+        state = POSITIONS['stonehenge_minimax_board']().current_state
+        self.assertEqual(
+            [line.strip() for line in str(state).split("\n")],
+            [line.strip() for line in STONEHENGE_MINIMAX_BOARD.strip("\n")
+             .split("\n")])
+
+    def test_regression_fails(self):
+        """
+        Test that running against a baseline much faster than this run
+        fails, and against a much slower one passes.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            args = ['--baseline', path, '--filter',
+                    'stonehenge_minimax_board.recursive', '--repeat', '1']
+            with redirect_stdout(StringIO()):
+                self.assertEqual(main(args + ['--save']), 0)
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)
+            self.assertEqual(list(baseline), [
+                'stonehenge_minimax_board.recursive_minimax',
+                'stonehenge_minimax_board.recursive_minimax_in_place'])
+            self.assertGreater(baseline[
+                'stonehenge_minimax_board.recursive_minimax']['nodes'], 0)
+
+            seconds = {name: result['seconds']
+                       for name, result in baseline.items()}
+            for factor, status in [(0.01, 1), (100, 0)]:
+                for name, result in baseline.items():
+                    result['seconds'] = seconds[name] * factor
+                with open(path, 'w') as baseline_file:
+                    json.dump(baseline, baseline_file)
+                output = StringIO()
+                with redirect_stdout(output):
+                    self.assertEqual(main(args), status)
+                self.assertEqual('REGRESSED' in output.getvalue(), status == 1)
+
+    def test_node_memory(self):
+        """
+        Test that the states search makes, and the nodes holding them, have
+        no __dict__, and that Stonehenge and SubtractSquare states stay
+        small.
+        """
+        for name, make_game in POSITIONS.items():
+            state = make_game().current_state
+            move = state.get_possible_moves()[0]
+            self.assertFalse(hasattr(state.make_move(move), '__dict__'), name)
+        memory = node_memory(
+            POSITIONS['stonehenge_3_after_a_b_c_d']().current_state)
+        self.assertLess(memory['bytes_per_state'], 300)
+        self.assertLess(memory['bytes_per_node'], 420)
+        memory = node_memory(POSITIONS['subtract_square_18']().current_state)
+        self.assertLess(memory['bytes_per_state'], 70)
+
+        with redirect_stdout(StringIO()) as output:
+            main(['--filter', 'subtract_square_18.make_move', '--repeat', '1'])
+        self.assertIn('B/state', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
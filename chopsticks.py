@@ -2,7 +2,7 @@
 Module for chopsticks game
 """
 from typing import List, Any, Dict
-from game import CurrentState
+from game_state import GameState
 
 
 class Chopsticks:
@@ -67,9 +67,7 @@ class Chopsticks:
         """Return a boolean stating whether the chopsticks game is over.
         """
 
-        if other.get_possible_moves() == []:
-            return True
-        return False
+        return other.is_terminal()
 
     def is_winner(self, player: str) -> bool:
         """Return a boolean stating if the current player is a winner of the
@@ -82,7 +80,7 @@ class Chopsticks:
             return False
 
 
-class ChopsticksState(CurrentState):
+class ChopsticksState(GameState):
     """ A class to represent the state of a chopsticks game.
     ===Attributes===
     get_current_player_name: return a string representing the current player
@@ -92,6 +90,8 @@ class ChopsticksState(CurrentState):
     played given a current game class.
     is_valid_move: a boolean method that checks if a move is valid.
     """
+    __slots__ = ('fingers',)
+
     def __init__(self, is_p1_turn: bool, fingers: Dict[str, int]) -> None:
         """Initialize the variables for a chopsticks game state.
         @param is_p1_turn a boolean that expresses whether it is player
@@ -100,9 +100,23 @@ class ChopsticksState(CurrentState):
         the values on each hand.
         """
 
-        self.player_one_turn = is_p1_turn
+        super().__init__(is_p1_turn)
         self.fingers = fingers
 
+    @property
+    def player_one_turn(self) -> bool:
+        """Return whether it is player one's turn, the same as p1_turn.
+        """
+
+        return self.p1_turn
+
+    @player_one_turn.setter
+    def player_one_turn(self, is_p1_turn: bool) -> None:
+        """Set whether it is player one's turn.
+        """
+
+        self.p1_turn = is_p1_turn
+
     def __str__(self):
         """Return a string representation of the current state of the game.
         """
@@ -111,12 +125,93 @@ class ChopsticksState(CurrentState):
             (self.fingers['p1 left hand'], self.fingers['p1 right hand'],
              self.fingers['p2 left hand'], self.fingers['p2 right hand'])
 
-    def __eq__(self, other) -> bool:
-        """Return whether current state self is equal to anoter current state.
+    def __repr__(self) -> str:
+        """Return a representation of this state (which can be used for
+        equality testing).
+        """
+
+        return "ChopsticksState(p1_turn={}, fingers={})".format(
+            self.p1_turn, self.fingers)
+
+    def state_key(self) -> Any:
+        """Return a hashable key which identifies this state.
+        """
+
+        return (self.p1_turn, self.fingers['p1 left hand'],
+                self.fingers['p1 right hand'], self.fingers['p2 left hand'],
+                self.fingers['p2 right hand'])
+
+    def zobrist_key(self) -> int:
+        """Return the index of this state among the 2 * 5 ** 4 states with
+        each hand holding 0 to 4.
+        """
+
+        index = 0
+        for hand in ['p1 left hand', 'p1 right hand', 'p2 left hand',
+                     'p2 right hand']:
+            index = index * 5 + self.fingers[hand]
+        return index * 2 + self.p1_turn
+
+    def is_terminal(self) -> bool:
+        """Return whether the game is over at this state, which is when
+        there are no moves left, found without listing them.
+
+        That is when at most one hand is left, or when two are left unless
+        they are p1's right hand and one of p2's, since two_hand_moves()
+        only finds moves then.
+
+        >>> ChopsticksState(True, {'p1 left hand': 0, 'p1 right hand': 2,
+        ...                        'p2 left hand': 0, 'p2 right hand': 3}
+        ...                 ).is_terminal()
+        False
+        >>> ChopsticksState(True, {'p1 left hand': 2, 'p1 right hand': 0,
+        ...                        'p2 left hand': 0, 'p2 right hand': 3}
+        ...                 ).is_terminal()
+        True
+        """
+
+        fingers = self.fingers
+        live_hands = 4 - list(fingers.values()).count(0)
+        if live_hands != 2:
+            return live_hands <= 1
+        return fingers['p1 left hand'] != 0 or fingers['p1 right hand'] == 0
+
+    def terminal_score(self) -> int:
+        """Return the score of the current player at this state, who has
+        lost since they have no moves left.
+        """
+
+        return self.LOSE
+
+    def rough_outcome(self) -> float:
+        """Return an estimate in interval [LOSE, WIN] of best outcome the
+        current player can guarantee from state self, looking two moves
+        ahead.
+
+        That is LOSE if the game is over, WIN if a move ends it, LOSE if
+        every move lets the other player end it, and DRAW otherwise.
+
+        >>> ChopsticksState(True, {'p1 left hand': 1, 'p1 right hand': 1,
+        ...                        'p2 left hand': 0, 'p2 right hand': 4}
+        ...                 ).rough_outcome()
+        1
+        >>> ChopsticksState(True, {'p1 left hand': 1, 'p1 right hand': 1,
+        ...                        'p2 left hand': 1, 'p2 right hand': 1}
+        ...                 ).rough_outcome()
+        0
         """
 
-        return type(self) == type(other) and self.fingers == other.fingers \
-            and self.player_one_turn == other.player_one_turn
+        if self.is_terminal():
+            return self.LOSE
+        next_states = [self.make_move(move)
+                       for move in self.get_possible_moves()]
+        if any(state.is_terminal() for state in next_states):
+            return self.WIN
+        if all(any(state.make_move(move).is_terminal()
+                   for move in state.get_possible_moves())
+               for state in next_states):
+            return self.LOSE
+        return self.DRAW
 
     def dead_hand(self, fingers: Dict[str, int])-> Dict[str, int]:
         """Return a modified dictionary, where any key-value pairs that map
@@ -0,0 +1,150 @@
+"""
+A retrograde solver for Chopsticks, which labels every state as a win, loss
+or draw (by repetition) for the player to move, and a strategy which plays
+perfectly by looking states up in the resulting table.
+
+Minimax cannot search Chopsticks since its states repeat, but there are only
+2 * 5 ** 4 of them, so all of them can be solved at once.
+"""
+from collections import deque
+from itertools import product
+from typing import Any, List, Optional
+from chopsticks import ChopsticksState
+from strategy import fallback_search, timed, SearchStats
+
+HANDS = ['p1 left hand', 'p1 right hand', 'p2 left hand', 'p2 right hand']
+MOVES = ['ll', 'lr', 'rl', 'rr']
+STATE_COUNT = 2 * 5 ** 4
+
+# The outcome of a state for the player to move is stored in the low 2 bits
+# of its entry, and the index in MOVES of its best move in the next 2.
+DRAW = 0
+WIN = 1
+LOSE = 2
+
+
+def all_states() -> List[ChopsticksState]:
+    """
+    Return every Chopsticks state, each at the index of its zobrist_key().
+
+    >>> states = all_states()
+    >>> len(states)
+    1250
+    >>> all(state.zobrist_key() == i for i, state in enumerate(states))
+    True
+    """
+    states = []
+    for values in product(range(5), repeat=4):
+        fingers = dict(zip(HANDS, values))
+        states.append(ChopsticksState(False, dict(fingers)))
+        states.append(ChopsticksState(True, dict(fingers)))
+    return states
+
+
+def solve() -> bytes:
+    """
+    Return the entry of each Chopsticks state, by the index of its
+    zobrist_key(): its outcome for the player to move, and the best move.
+
+    Working backwards from the states with no moves, which are losses, a
+    state is a win once any move leads to a loss, and a loss once every
+    move leads to a win. Whatever is left can only be played out forever,
+    so is a draw.
+
+    A win's best move is one reaching a loss in the fewest moves, and a
+    loss's best move is one putting off the other player's win the longest,
+    so perfect play does not go around in circles.
+    """
+    states = all_states()
+    successors = [[(MOVES.index(move), state.make_move(move).zobrist_key())
+                   for move in state.get_possible_moves()]
+                  for state in states]
+    predecessors = [[] for _ in states]
+    for index in range(STATE_COUNT):
+        for move, successor in successors[index]:
+            predecessors[successor].append((move, index))
+
+    outcomes = [DRAW] * STATE_COUNT
+    best_moves = [0] * STATE_COUNT
+    unresolved = [len(moves) for moves in successors]
+    queue = deque(index for index in range(STATE_COUNT)
+                  if not successors[index])
+    for index in queue:
+        outcomes[index] = LOSE
+    while queue:
+        index = queue.popleft()
+        for move, predecessor in predecessors[index]:
+            if outcomes[predecessor] != DRAW:
+                continue
+            if outcomes[index] == LOSE:
+                outcomes[predecessor] = WIN
+                best_moves[predecessor] = move
+                queue.append(predecessor)
+            else:
+                unresolved[predecessor] -= 1
+                if unresolved[predecessor] == 0:
+                    outcomes[predecessor] = LOSE
+                    best_moves[predecessor] = move
+                    queue.append(predecessor)
+
+    for index in range(STATE_COUNT):
+        if outcomes[index] == DRAW and successors[index]:
+            best_moves[index] = next(move for move, successor
+                                     in successors[index]
+                                     if outcomes[successor] == DRAW)
+    return bytes(outcome | move << 2
+                 for outcome, move in zip(outcomes, best_moves))
+
+
+_TABLE = None
+
+
+def get_table() -> bytes:
+    """
+    Return the entries of every Chopsticks state, which are only solved the
+    first time they are asked for.
+    """
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = solve()
+    return _TABLE
+
+
+def outcome(state: ChopsticksState) -> int:
+    """
+    Return the outcome of state for the player to move under perfect play:
+    WIN, LOSE or DRAW.
+
+    >>> outcome(ChopsticksState(True, {'p1 left hand': 1,
+    ...     'p1 right hand': 1, 'p2 left hand': 1, 'p2 right hand': 1}))
+    0
+    """
+    return get_table()[state.zobrist_key()] & 3
+
+
+def best_move(state: ChopsticksState) -> Optional[str]:
+    """
+    Return a best move for the player to move at state, or None if there
+    are no moves.
+    """
+    if state.is_terminal():
+        return None
+    return MOVES[get_table()[state.zobrist_key()] >> 2]
+
+
+@timed
+def chopsticks_table_strategy(game: Any,
+                              stats: Optional[SearchStats] = None) -> Any:
+    """
+    Return a best move for game, looked up in the table of solved states if
+    game is Chopsticks, otherwise found by alpha_beta_strategy.
+
+    A move looked up is counted in stats, if it is given, as a table hit.
+    """
+    state = game.current_state
+    if isinstance(state, ChopsticksState):
+        if stats is not None:
+            stats.visit(0)
+            stats.table_hits += 1
+        return best_move(state)
+    return fallback_search(game, stats)
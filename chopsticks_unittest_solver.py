@@ -0,0 +1,88 @@
+import unittest
+
+from game_interface import playable_games, usable_strategies
+from chopsticks_solver import all_states, best_move, outcome, \
+    chopsticks_table_strategy, WIN, LOSE, DRAW
+from strategy import alpha_beta_strategy, SearchStats, TranspositionTable
+ChopsticksGame = playable_games['c']
+StonehengeGame = playable_games['h']
+
+
+class ChopsticksSolverUnitTests(unittest.TestCase):
+    def test_outcomes_consistent(self):
+        """
+        Test that every win has a move to a loss, every loss only has moves
+        to wins, and every draw has no move to a loss.
+        """
+        for state in all_states():
+            outcomes = [outcome(state.make_move(move))
+                        for move in state.get_possible_moves()]
+            if outcome(state) == WIN:
+                self.assertEqual(outcome(state.make_move(best_move(state))),
+                                 LOSE)
+            elif outcome(state) == LOSE:
+                self.assertTrue(all(result == WIN for result in outcomes))
+            else:
+                self.assertNotIn(LOSE, outcomes)
+                self.assertEqual(outcome(state.make_move(best_move(state))),
+                                 DRAW)
+
+    def test_wins_are_won(self):
+        """
+        Test that both players playing by the table from a win ends the game
+        with the first player winning.
+        """
+        for state in all_states():
+            if outcome(state) != WIN:
+                continue
+            player = state.get_current_player_name()
+            moves = 0
+            while not state.is_terminal():
+                state = state.make_move(best_move(state))
+                moves += 1
+                self.assertLess(moves, 50)
+            self.assertNotEqual(state.get_current_player_name(), player)
+
+    def test_table_strategy(self):
+        """
+        Test that chopsticks_table_strategy returns a valid move, which keeps
+        the starting position drawn.
+        """
+        game = ChopsticksGame(True)
+        move = chopsticks_table_strategy(game)
+        self.assertTrue(game.current_state.is_valid_move(move))
+        self.assertEqual(outcome(game.current_state), DRAW)
+        self.assertEqual(outcome(game.current_state.make_move(move)), DRAW)
+
+    def test_table_strategy_stats(self):
+        """
+        Test that chopsticks_table_strategy counts a lookup as one node and
+        one table hit, is registered as 'ct', and searches for other games.
+        """
+        game = ChopsticksGame(True)
+        stats = SearchStats()
+        move = chopsticks_table_strategy(game, stats=stats)
+        self.assertEqual((stats.nodes, stats.table_hits), (1, 1))
+        self.assertEqual(usable_strategies['ct'](game), move)
+
+        game = StonehengeGame(True, 1)
+        self.assertEqual(chopsticks_table_strategy(game),
+                         alpha_beta_strategy(game, TranspositionTable()))
+
+    def test_rough_outcome(self):
+        """
+        Test that rough_outcome() only calls states wins or losses when
+        they are, and calls every state which is over a loss.
+        """
+        for state in all_states():
+            rough = state.rough_outcome()
+            if rough == state.WIN:
+                self.assertEqual(outcome(state), WIN)
+            elif rough == state.LOSE:
+                self.assertEqual(outcome(state), LOSE)
+            else:
+                self.assertFalse(state.is_terminal())
+
+
+if __name__ == "__main__":
+    unittest.main()
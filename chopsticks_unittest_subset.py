@@ -153,6 +153,21 @@ class ChopsticksUnitTests(unittest.TestCase):
                          "a state that is over (e.g. a player with both " +
                          "hands being 0 in Chopsticks).")
 
+    def test_is_over_matches_possible_moves(self):
+        """
+        Test that is_over, which does not list the moves left, is True for
+        exactly the states with no possible moves.
+        """
+        game = ChopsticksGame(True)
+        hands = ['p1 left hand', 'p1 right hand', 'p2 left hand',
+                 'p2 right hand']
+        for index in range(2 * 5 ** 4):
+            values = [index // 5 ** hand % 5 for hand in range(4)]
+            state = type(game.current_state)(index < 5 ** 4,
+                                             dict(zip(hands, values)))
+            self.assertEqual(game.is_over(state),
+                             state.get_possible_moves() == [], str(state))
+
     def test_is_winner_return(self):
         """
         Test the return type of is_winner to ensure that it returns a boolean.
@@ -26,7 +26,7 @@ class Game:
         """
         Return whether or not this game is over at state.
         """
-        raise NotImplementedError
+        return state.is_terminal()
 
     def is_winner(self, player: str) -> bool:
         """
@@ -34,7 +34,12 @@ class Game:
 
         Precondition: player is 'p1' or 'p2'.
         """
-        raise NotImplementedError
+        state = self.current_state
+        if not state.is_terminal():
+            return False
+        if state.get_current_player_name() == player:
+            return state.terminal_score() == state.WIN
+        return state.terminal_score() == state.LOSE
 
     def str_to_move(self, string: str) -> Any:
         """
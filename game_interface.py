@@ -10,15 +10,42 @@ your own curiousity!)
 """
 # TODO: import the modules needed to make game_interface run.
 from strategy import interactive_strategy, rough_outcome_strategy, \
-    recursive_minimax_strategy, iterative_minimax_strategy
-from typing import Any, Callable
+    recursive_minimax_strategy, iterative_minimax_strategy, \
+    alpha_beta_strategy, iterative_deepening_strategy, mcts_strategy, \
+    parallel_minimax_strategy, proof_number_strategy, SearchStats
+from importlib import import_module
+from typing import Any, Callable, Optional
 from subtract_square_game import SubtractSquareGame
 from stonehenge import StonehengeGame
+from chopsticks import Chopsticks
+
+
+def lazy_strategy(module: str, name: str) -> Callable:
+    """
+    Return a strategy that imports the strategy called name from module
+    the first time it is used, and then behaves like it.
+
+    This keeps the dependencies of table-based strategies (numpy) from
+    being imported with this module when nobody plays them.
+
+    >>> strategy = lazy_strategy('strategy', 'alpha_beta_strategy')
+    >>> strategy.__name__
+    'alpha_beta_strategy'
+    """
+    def strategy(game: Any, stats: Optional[SearchStats] = None) -> Any:
+        """
+        Return a move for game chosen by the strategy name in module.
+        """
+        return getattr(import_module(module), name)(game, stats=stats)
+    strategy.__name__ = strategy.__qualname__ = name
+    return strategy
+
 
 # TODO: Replace None with the corresponding class name for your games.
 # 'h' should map to Stonehenge.
 playable_games = {'s': SubtractSquareGame,
-                  'h': StonehengeGame}
+                  'h': StonehengeGame,
+                  'c': Chopsticks}
 
 # TODO: Replace None with the corresponding function names for your strategies.
 # 'mr' should map to your recursive implementation of minimax while
@@ -26,7 +53,23 @@ playable_games = {'s': SubtractSquareGame,
 usable_strategies = {'i': interactive_strategy,
                      'ro': rough_outcome_strategy,
                      'mr': recursive_minimax_strategy,
-                     'mi': iterative_minimax_strategy}
+                     'mi': iterative_minimax_strategy,
+                     'ab': alpha_beta_strategy,
+                     'id': iterative_deepening_strategy,
+                     'mc': mcts_strategy,
+                     'mp': parallel_minimax_strategy,
+                     'pn': proof_number_strategy,
+                     'tb': lazy_strategy('stonehenge_tablebase',
+                                         'tablebase_strategy'),
+                     'st': lazy_strategy('subtract_square_solver',
+                                         'table_strategy'),
+                     'ct': lazy_strategy('chopsticks_solver',
+                                         'chopsticks_table_strategy')}
+
+# The keys of the strategies which cannot play each game. Chopsticks states
+# can repeat, so strategies which search to the end of the game (or fall
+# back to one that does, like 'tb' and 'st') never finish.
+unusable_strategies = {'c': {'mr', 'mi', 'ab', 'mp', 'pn', 'tb', 'st'}}
 
 
 class GameInterface:
@@ -36,7 +79,8 @@ class GameInterface:
     """
 
     def __init__(self, game: Any, p1_strategy: Callable,
-                 p2_strategy: Callable[[Any], Any]) -> None:
+                 p2_strategy: Callable[[Any], Any],
+                 p1_starts: Optional[bool] = None) -> None:
         """
         Initialize this GameInterface, setting its active game to game, and
         using the strategies p1_strategy for Player 1 and p2_strategy for
@@ -48,19 +92,28 @@ class GameInterface:
         :type p1_strategy:
         :param p2_strategy: The strategy for Play 2.
         :type p2_strategy:
+        :param p1_starts: Whether Player 1 makes the first move. The user is
+                          asked if it is not given.
+        :type p1_starts: bool
         """
-        first_player = input("Type y if player 1 is to make the first move: ")
-        is_p1_turn = False
-        if first_player.lower() == 'y':
-            is_p1_turn = True
+        is_p1_turn = p1_starts
+        if is_p1_turn is None:
+            first_player = input(
+                "Type y if player 1 is to make the first move: ")
+            is_p1_turn = False
+            if first_player.lower() == 'y':
+                is_p1_turn = True
 
         self.game = game(is_p1_turn)
         self.p1_strategy = p1_strategy
         self.p2_strategy = p2_strategy
 
-    def play(self) -> None:
+    def play(self, show_stats: bool = False) -> None:
         """
         Play the game.
+
+        If show_stats is True, a summary of the search each strategy did to
+        choose its move is printed after the move.
         """
         current_state = self.game.current_state
 
@@ -78,11 +131,15 @@ class GameInterface:
                 print(move)
 
             # Pick a (legal) move.
+            stats = SearchStats()
             while not current_state.is_valid_move(move_to_make):
                 current_strategy = self.p2_strategy
                 if current_state.get_current_player_name() == 'p1':
                     current_strategy = self.p1_strategy
-                move_to_make = current_strategy(self.game)
+                if show_stats:
+                    move_to_make = current_strategy(self.game, stats=stats)
+                else:
+                    move_to_make = current_strategy(self.game)
 
             # Apply the move
             current_player_name = current_state.get_current_player_name()
@@ -93,6 +150,8 @@ class GameInterface:
             print("{} made the move {}. The game's state is now:".format(
                 current_player_name, move_to_make))
             print(current_state)
+            if show_stats:
+                print("{} searched {}".format(current_player_name, stats))
 
         # Print out the winner of the game
         if self.game.is_winner("p1"):
@@ -122,10 +181,11 @@ if __name__ == '__main__':
     p1 = ''
     p2 = ''
 
-    while p1 not in usable_strategies.keys():
+    unusable = unusable_strategies.get(chosen_game, set())
+    while p1 not in usable_strategies.keys() or p1 in unusable:
         p1 = input("Select the strategy for Player 1 ({}): ".format(strategies))
 
-    while p2 not in usable_strategies.keys():
+    while p2 not in usable_strategies.keys() or p2 in unusable:
         p2 = input("Select the strategy for Player 2 ({}): ".format(strategies))
 
     GameInterface(playable_games[chosen_game], usable_strategies[p1],
@@ -20,6 +20,9 @@ class GameState:
     DRAW: int = 0
     p1_turn: bool
 
+    # Search makes a great many states, so none of them has a __dict__.
+    __slots__ = ('p1_turn',)
+
     def __init__(self, is_p1_turn: bool) -> None:
         """
         Initialize this game state and set the current player based on
@@ -55,12 +58,53 @@ class GameState:
         """
         raise NotImplementedError
 
+    def apply_move(self, move: Any) -> None:
+        """
+        Apply move to this GameState itself, instead of returning a new one,
+        so that a search can make and take back moves on a single state
+        without allocating any.
+
+        By default states cannot be changed in place.
+        """
+        raise NotImplementedError
+
+    def undo_move(self) -> None:
+        """
+        Take back the last move applied with apply_move() which has not been
+        taken back yet.
+        """
+        raise NotImplementedError
+
     def is_valid_move(self, move: Any) -> bool:
         """
         Return whether move is a valid move for this GameState.
         """
         return move in self.get_possible_moves()
 
+    def move_prior(self, move: Any) -> int:
+        """
+        Return a cheap guess at how good move is for the current player, for
+        searching better moves first: the higher, the better.
+
+        By default every move is as good as any other.
+        """
+        return 0
+
+    def is_terminal(self) -> bool:
+        """
+        Return whether the game is over at this state.
+        """
+        raise NotImplementedError
+
+    def terminal_score(self) -> int:
+        """
+        Return the score (WIN, LOSE or DRAW) of the current player at this
+        state.
+
+        Precondition: self.is_terminal()
+        """
+        raise NotImplementedError
+
     def __repr__(self) -> Any:
         """
         Return a representation of this state (which can be used for
@@ -68,6 +112,50 @@ class GameState:
         """
         raise NotImplementedError
 
+    def state_key(self) -> Any:
+        """
+        Return a hashable key which identifies this state, so that search
+        results for it can be cached (e.g. in a transposition table).
+
+        Two states with equal keys must have the same outcome under perfect
+        play. By default this is repr(self).
+        """
+        return repr(self)
+
+    def zobrist_key(self) -> int:
+        """
+        Return an integer hash of this state, which subclasses should be able
+        to update cheaply in make_move (e.g. by Zobrist hashing).
+
+        States with equal state_key()s must have equal keys, and states with
+        different state_key()s should rarely share one. By default this is
+        the hash of state_key().
+        """
+        return hash(self.state_key())
+
+    def canonical_key(self) -> int:
+        """
+        Return an integer key which is the same for this state and every
+        state equivalent to it under a symmetry of the board, so that search
+        results for one can be reused for all of them.
+
+        By default a game has no symmetries and this is zobrist_key().
+        """
+        return self.zobrist_key()
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether this state is the same as other.
+        """
+        return type(self) == type(other) and \
+            self.state_key() == other.state_key()
+
+    def __hash__(self) -> int:
+        """
+        Return a hash of this state consistent with __eq__.
+        """
+        return self.zobrist_key()
+
     def rough_outcome(self) -> float:
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
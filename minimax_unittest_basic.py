@@ -21,13 +21,24 @@ strategy with Chopsticks either, unless you handle repeated/looping states.
 import unittest
 from unittest.mock import patch
 import inspect
+import time
+from random import Random
 
 # Import the student solution
-from game_interface import playable_games, usable_strategies
+from game_interface import GameInterface, playable_games, usable_strategies
+from strategy import MoveOrdering, SearchStats, TranspositionTable, \
+    TRANSPOSITION_TABLE, fallback_search, recursive_helper, \
+    proof_number_search
 minimax_iterative_strategy = usable_strategies['mi']
 minimax_recursive_strategy = usable_strategies['mr']
+alpha_beta_strategy = usable_strategies['ab']
+iterative_deepening_strategy = usable_strategies['id']
+mcts_strategy = usable_strategies['mc']
+parallel_minimax_strategy = usable_strategies['mp']
+proof_number_strategy = usable_strategies['pn']
 StonehengeGame = playable_games['h']
 SubtractSquareGame = playable_games['s']
+ChopsticksGame = playable_games['c']
 
 STONEHENGE_MINIMAX_BOARD = """\
           2   1
@@ -43,6 +54,24 @@ STONEHENGE_MINIMAX_BOARD = """\
         2   2   1
 """
 
+
+def _stonehenge_positions():
+    """
+    Return games of Stonehenge with a side-length of 2, after a few
+    different sequences of moves, for testing strategies against each other.
+    """
+    games = []
+    for moves_to_make in [[], ['A'], ['A', 'F', 'D'], ['G', 'B'],
+                          ['C', 'E', 'A', 'G']]:
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        for move in moves_to_make:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+        games.append(game)
+    return games
+
+
 class MinimaxUnitTests(unittest.TestCase):
     def test_iterative_subtract_square_4(self):
         """
@@ -232,5 +261,382 @@ class MinimaxUnitTests(unittest.TestCase):
                              expected_move, move_chosen, str(new_state)
                          ))
 
+    def test_default_table_shared_between_games(self):
+        """
+        Test that searching one game through the default transposition table
+        does not change the moves found for a different game searched through
+        it afterwards.
+        """
+        TRANSPOSITION_TABLE.clear()
+        minimax_iterative_strategy(StonehengeGame(False, 1))
+        game = SubtractSquareGame(False, 4)
+        for strategy in [minimax_recursive_strategy, minimax_iterative_strategy,
+                         alpha_beta_strategy]:
+            self.assertEqual(strategy(game), 4, strategy.__name__)
+        TRANSPOSITION_TABLE.clear()
+
+    def test_transposition_table_reused(self):
+        """
+        Test that both minimax implementations find the same moves when given a
+        transposition table, and that repeated positions are looked up in it
+        instead of being searched again.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+        expected_moves = [game.str_to_move("1"), game.str_to_move("16")]
+
+        table = TranspositionTable(max_entries=100)
+        self.assertIn(minimax_recursive_strategy(game, table), expected_moves)
+        self.assertGreater(table.hits, 0)
+        self.assertLessEqual(len(table), 100)
+
+        table = TranspositionTable(max_entries=100)
+        self.assertIn(minimax_iterative_strategy(game, table), expected_moves)
+        self.assertGreater(table.hits, 0)
+
+        small_table = TranspositionTable(max_entries=3)
+        self.assertIn(minimax_recursive_strategy(game, small_table),
+                      expected_moves)
+        self.assertEqual(len(small_table), 3)
+
+    def test_alpha_beta_matches_recursive_subtract_square(self):
+        """
+        Test that alpha-beta picks the same move as recursive minimax on games
+        of SubtractSquare with values 1 to 30.
+        """
+        for value in range(1, 31):
+            with patch('builtins.input', return_value=str(value)):
+                game = SubtractSquareGame(True)
+            self.assertEqual(alpha_beta_strategy(game, TranspositionTable()),
+                             minimax_recursive_strategy(game,
+                                                        TranspositionTable()),
+                             "Alpha-beta and recursive minimax disagree on " +
+                             "SubtractSquare with a value of {}.".format(value))
+
+    def test_alpha_beta_matches_recursive_stonehenge(self):
+        """
+        Test that alpha-beta picks the same move as recursive minimax on a few
+        games of Stonehenge with a side-length of 2, without changing the
+        game's current_state.
+        """
+        for game in _stonehenge_positions():
+            state = game.current_state
+            self.assertEqual(alpha_beta_strategy(game, TranspositionTable()),
+                             minimax_recursive_strategy(game,
+                                                        TranspositionTable()),
+                             "Alpha-beta and recursive minimax disagree " +
+                             "at {}.".format(repr(state)))
+            self.assertIs(game.current_state, state)
+
+    def test_iterative_deepening_finds_winning_moves(self):
+        """
+        Test that iterative deepening, given enough time, finds the same
+        winning moves as minimax.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+        self.assertIn(iterative_deepening_strategy(game, 1.0),
+                      [game.str_to_move("1"), game.str_to_move("16")])
+
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        for move in ['A', 'F', 'D']:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+        self.assertEqual(iterative_deepening_strategy(game, 1.0),
+                         game.str_to_move('E'))
+
+    def test_move_ordering_finds_moves_as_good(self):
+        """
+        Test that alpha-beta and iterative deepening searching moves in the
+        order a MoveOrdering gives them find moves as good as the ones
+        recursive minimax finds.
+        """
+        games = []
+        for value in range(1, 31):
+            with patch('builtins.input', return_value=str(value)):
+                games.append(SubtractSquareGame(True))
+        games.extend(_stonehenge_positions())
+        table = TranspositionTable()
+        for game in games:
+            state = game.current_state
+            expected_score = recursive_helper(game, state.make_move(
+                minimax_recursive_strategy(game, table)), table)
+            for move in [
+                    alpha_beta_strategy(game, TranspositionTable(),
+                                        ordering=MoveOrdering()),
+                    iterative_deepening_strategy(game, 1.0,
+                                                 ordering=MoveOrdering())]:
+                self.assertEqual(recursive_helper(game, state.make_move(move),
+                                                  table), expected_score,
+                                 repr(state))
+
+    def test_move_ordering_cuts_off_sooner(self):
+        """
+        Test that a MoveOrdering makes alpha-beta search fewer states on an
+        empty Stonehenge board with a side-length of 3, with more of its
+        cutoffs made by the first move searched.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(True)
+        stats, ordered_stats = SearchStats(), SearchStats()
+        alpha_beta_strategy(game, TranspositionTable(), stats=stats)
+        alpha_beta_strategy(game, TranspositionTable(), stats=ordered_stats,
+                            ordering=MoveOrdering())
+        self.assertLess(ordered_stats.nodes, stats.nodes / 2)
+        self.assertGreater(ordered_stats.first_move_cutoff_rate(),
+                           stats.first_move_cutoff_rate())
+        self.assertGreater(ordered_stats.first_move_cutoff_rate(), 0.9)
+
+    def test_proof_number_search_finds_winning_moves(self):
+        """
+        Test that proof-number search proves a win exactly when minimax finds
+        one, and that the move it returns wins, even with few table entries.
+        """
+        states = []
+        for value in range(1, 31):
+            with patch('builtins.input', return_value=str(value)):
+                states.append(SubtractSquareGame(True).current_state)
+        states.extend(game.current_state for game in _stonehenge_positions())
+        table = TranspositionTable()
+        for state in states:
+            for max_entries in [10, 100000]:
+                won, move = proof_number_search(state,
+                                                max_entries=max_entries)
+                self.assertEqual(won, recursive_helper(None, state, table) ==
+                                 state.WIN, repr(state))
+                if won:
+                    self.assertEqual(recursive_helper(
+                        None, state.make_move(move), table), state.LOSE)
+                else:
+                    self.assertIsNone(move)
+
+    def test_proof_number_strategy(self):
+        """
+        Test that proof_number_strategy wins on an empty Stonehenge board
+        with a side-length of 3, searching fewer states than minimax, and
+        falls back to alpha-beta where it cannot win.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(True)
+        stats, minimax_stats = SearchStats(), SearchStats()
+        move = proof_number_strategy(game, TranspositionTable(), stats=stats)
+        minimax_recursive_strategy(game, TranspositionTable(),
+                                   stats=minimax_stats)
+        self.assertEqual(recursive_helper(
+            game, game.current_state.make_move(move), TranspositionTable()),
+            -1)
+        self.assertLess(stats.nodes, minimax_stats.nodes / 10)
+
+        with patch('builtins.input', return_value='7'):
+            game = SubtractSquareGame(True)
+        self.assertEqual(proof_number_strategy(game, TranspositionTable()),
+                         alpha_beta_strategy(game, TranspositionTable()))
+
+    def test_fallback_search(self):
+        """
+        Test that fallback_search picks alpha-beta's move, counting the
+        states it searches but not the time it takes.
+        """
+        with patch('builtins.input', return_value='30'):
+            game = SubtractSquareGame(True)
+        stats = SearchStats()
+        self.assertEqual(fallback_search(game, stats),
+                         alpha_beta_strategy(game, TranspositionTable()))
+        self.assertGreater(stats.nodes, 1)
+        self.assertEqual(stats.seconds, 0.0)
+        self.assertEqual(fallback_search(game), fallback_search(game, stats))
+
+    def test_iterative_deepening_time_limit(self):
+        """
+        Test that iterative deepening returns a valid move on a large
+        Stonehenge board without searching it to the end.
+        """
+        with patch('builtins.input', return_value='5'):
+            game = StonehengeGame(True)
+        start = time.perf_counter()
+        move_chosen = iterative_deepening_strategy(game, 0.05)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertTrue(game.current_state.is_valid_move(move_chosen))
+
+    def test_mcts_finds_winning_moves(self):
+        """
+        Test that Monte Carlo Tree Search finds winning moves with both kinds
+        of playout, and leaves the game's current_state unchanged.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+        self.assertIn(mcts_strategy(game, 2000, rng=Random(0)),
+                      [game.str_to_move("1"), game.str_to_move("16")])
+
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        for move in ['A', 'F', 'D']:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+        state = game.current_state
+        self.assertEqual(mcts_strategy(game, 2000, rng=Random(0)),
+                         game.str_to_move('E'))
+        self.assertEqual(mcts_strategy(game, 500, playout='rough',
+                                       rng=Random(0)),
+                         game.str_to_move('E'))
+        self.assertIs(game.current_state, state)
+
+    def test_mcts_time_limit(self):
+        """
+        Test that Monte Carlo Tree Search returns a valid move on a large
+        Stonehenge board within its time budget.
+        """
+        with patch('builtins.input', return_value='5'):
+            game = StonehengeGame(True)
+        start = time.perf_counter()
+        move_chosen = mcts_strategy(game, time_limit=0.1, rng=Random(0))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertTrue(game.current_state.is_valid_move(move_chosen))
+
+    def test_mcts_chopsticks_finishes(self):
+        """
+        Test that Monte Carlo Tree Search returns a valid move on Chopsticks,
+        whose states repeat, within its time budget, for both a fixed number
+        of playouts and a time limit.
+        """
+        game = ChopsticksGame(True)
+        start = time.perf_counter()
+        move_chosen = mcts_strategy(game, 100, rng=Random(0))
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertTrue(game.current_state.is_valid_move(move_chosen))
+        start = time.perf_counter()
+        move_chosen = mcts_strategy(game, time_limit=0.1, rng=Random(0))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertTrue(game.current_state.is_valid_move(move_chosen))
+
+    def test_parallel_minimax_matches_recursive(self):
+        """
+        Test that parallel minimax picks the same move as recursive minimax
+        when splitting the search at depths 1 and 2.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+        self.assertEqual(parallel_minimax_strategy(game, 2),
+                         minimax_recursive_strategy(game))
+
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        for move in ['A', 'F']:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+        state = game.current_state
+        expected_move = minimax_recursive_strategy(game)
+        for split_depth in [1, 2]:
+            self.assertEqual(parallel_minimax_strategy(game, 2, split_depth),
+                             expected_move)
+        self.assertIs(game.current_state, state)
+
+    def test_iterative_memory_bounded(self):
+        """
+        Test that iterative minimax only keeps the states along the path it
+        is searching, and their siblings, rather than the whole game tree.
+        """
+        import strategy
+        live = [0, 0]
+
+        class CountedState(strategy.PotentialState):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                live[0] += 1
+                live[1] = max(live[1], live[0])
+
+            def __del__(self):
+                live[0] -= 1
+
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        expected_move = minimax_recursive_strategy(game, TranspositionTable())
+        stats = strategy.SearchStats()
+        with patch('strategy.PotentialState', CountedState):
+            self.assertEqual(minimax_iterative_strategy(
+                game, TranspositionTable(), stats=stats), expected_move)
+        # No more than 7 moves are searched from each of 7 plies.
+        self.assertLessEqual(live[1], 1 + 7 * 7)
+        self.assertLess(live[1], stats.nodes)
+
+    def test_in_place_matches_make_move(self):
+        """
+        Test that searching with moves applied to the game's state in place
+        picks the same moves as making new states, searches the same number
+        of states, and leaves the game's state as it was.
+        """
+        games = []
+        for value in [4, 18, 30]:
+            with patch('builtins.input', return_value=str(value)):
+                games.append(SubtractSquareGame(True))
+        for moves_to_make in [['A'], ['A', 'F', 'D'], ['G', 'B']]:
+            with patch('builtins.input', return_value='2'):
+                game = StonehengeGame(True)
+            for move in moves_to_make:
+                game.current_state = game.current_state.make_move(
+                    game.str_to_move(move))
+            games.append(game)
+        for game in games:
+            state = game.current_state
+            before = repr(state), state.canonical_key()
+            for strategy in [minimax_recursive_strategy, alpha_beta_strategy]:
+                stats, in_place_stats = SearchStats(), SearchStats()
+                self.assertEqual(
+                    strategy(game, TranspositionTable(), stats=stats),
+                    strategy(game, TranspositionTable(), stats=in_place_stats,
+                             in_place=True), repr(state))
+                self.assertEqual(stats.nodes, in_place_stats.nodes)
+                self.assertIs(game.current_state, state)
+                self.assertEqual((repr(state), state.canonical_key()), before)
+
+    def test_search_stats(self):
+        """
+        Test that each strategy which searches counts what it searched, and
+        how long it took, in the stats it is given.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+        for strategy in [minimax_recursive_strategy,
+                         minimax_iterative_strategy, alpha_beta_strategy]:
+            stats = SearchStats()
+            strategy(game, TranspositionTable(), stats=stats)
+            # Subtracting 1 each time makes the longest game.
+            self.assertIn(stats.max_depth, range(2, 19), strategy.__name__)
+            self.assertGreater(stats.terminals, 0, strategy.__name__)
+            self.assertGreater(stats.table_hits, 0, strategy.__name__)
+            self.assertGreater(stats.seconds, 0, strategy.__name__)
+
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        for strategy in [iterative_deepening_strategy, mcts_strategy]:
+            stats = SearchStats()
+            strategy(game, stats=stats)
+            self.assertGreater(stats.nodes, stats.expanded, strategy.__name__)
+            self.assertGreater(stats.branching_factor(), 1, strategy.__name__)
+            self.assertGreater(stats.max_depth, 1, strategy.__name__)
+
+        stats = SearchStats()
+        self.assertEqual(minimax_recursive_strategy(game, TranspositionTable()),
+                         minimax_recursive_strategy(game, TranspositionTable(),
+                                                    stats=stats))
+        self.assertEqual(stats.expanded + stats.terminals + stats.table_hits,
+                         stats.nodes)
+
+    def test_play_shows_stats(self):
+        """
+        Test that GameInterface.play prints the stats of each move's search
+        when asked to.
+        """
+        with patch('builtins.input', return_value='2'):
+            interface = GameInterface(SubtractSquareGame, alpha_beta_strategy,
+                                      alpha_beta_strategy, True)
+        with patch('builtins.print') as mock_print:
+            interface.play(show_stats=True)
+        lines = [str(call[0][0]) for call in mock_print.call_args_list]
+        self.assertEqual(len([line for line in lines
+                              if ' searched ' in line]), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
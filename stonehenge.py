@@ -2,317 +2,667 @@
 An implementation of a game of Stonehenge
 """
 
-from typing import List, Any, Dict
+from random import Random
+from typing import List, Any, Dict, Optional, Tuple
 from game import Game
 from game_state import GameState
 
-"""Dictionary constants to represent the Ley-Lines of each of the 5 
-game boards."""
-
-BOARD_1 = {1: ['@', 'A', 'B'], 2: ['@', 'C'], 3: ['@', 'C', 'A'], 4: ['@', 'B'],
-           5: ['@', 'B', 'C'], 6: ['@', 'A']}
-
-BOARD_2 = {1: ['@', 'A', 'B'], 2: ['@', 'C', 'D', 'E'], 3: ['@', 'F', 'G'],
-           4: ['@', 'F', 'C'], 5: ['@', 'G', 'D', 'A'], 6: ['@', 'E', 'B'],
-           7: ['@', 'E', 'G'], 8: ['@', 'B', 'D', 'F'], 9: ['@', 'A', 'C']}
-
-BOARD_3 = {1: ['@', 'A', 'B'], 2: ['@', 'C', 'D', 'E'],
-           3: ['@', 'F', 'G', 'H', 'I'], 4: ['@', 'J', 'K', 'L'],
-           5: ['@', 'J', 'F'], 6: ['@', 'K', 'G', 'C'],
-           7: ['@', 'L', 'H', 'D', 'A'], 8: ['@', 'E', 'B', 'I'],
-           9: ['@', 'I', 'L'], 10: ['@', 'E', 'H', 'K'],
-           11: ['@', 'B', 'D', 'G', 'J'], 12: ['@', 'A', 'C', 'F']}
-
-BOARD_4 = {1: ['@', 'A', 'B'], 2: ['@', 'C', 'D', 'E'],
-           3: ['@', 'F', 'G', 'H', 'I'], 4: ['@', 'J', 'K', 'L', 'M', 'N'],
-           5: ['@', 'O', 'P', 'Q', 'R'], 6: ['@', 'O', 'J'],
-           7: ['@', 'P', 'K', 'F'], 8: ['@', 'Q', 'L', 'G', 'C'],
-           9: ['@', 'R', 'M', 'H', 'D', 'A'], 10: ['@', 'N', 'R'],
-           11: ['@', 'I', 'M', 'Q'], 12: ['@', 'E', 'H', 'L', 'P'],
-           13: ['@', 'B', 'D', 'G', 'K', 'O'], 14: ['@', 'A', 'C', 'F', 'J'],
-           15: ['@', 'N', 'I', 'E', 'B']}
-
-BOARD_5 = {1: ['@', 'A', 'B'], 2: ['@', 'C', 'D', 'E'],
-           3: ['@', 'F', 'G', 'H', 'I'], 4: ['@', 'J', 'K', 'L', 'M', 'N'],
-           5: ['@', 'O', 'P', 'Q', 'R', 'S', 'T'],
-           6: ['@', 'U', 'V', 'W', 'X', 'Y'], 7: ['@', 'U', 'O'],
-           8: ['@', 'V', 'P', 'J'], 9: ['@', 'W', 'Q', 'K', 'F'],
-           10: ['@', 'X', 'R', 'L', 'G', 'C'],
-           11: ['@', 'Y', 'S', 'M', 'H', 'D', 'A'], 12: ['@', 'T', 'Y'],
-           13: ['@', 'N', 'S', 'X'], 14: ['@', 'I', 'M', 'R', 'W'],
-           15: ['@', 'E', 'H', 'L', 'Q', 'V'],
-           16: ['@', 'B', 'D', 'G', 'K', 'P', 'U'],
-           17: ['@', 'A', 'C', 'F', 'J', 'O'],
-           18: ['@', 'T', 'N', 'I', 'E', 'B']}
+# Boards are drawn indented as far as the hand-written boards which
+# BoardLayout replaced were, and with the same trailing spaces after some
+# lines (by side length, then line number), so that they are drawn byte for
+# byte as before.
+BOARD_INDENT = ' ' * 12
+LEGACY_TRAILING_SPACES = {4: {8: 1}, 5: {2: 11, 12: 1}}
 
 
-class StonehengeGame(Game):
+class BoardLayout:
     """
-    A class to represent a Stonehenge game.
+    The cells and ley-lines of a Stonehenge board of one side length, with
+    cells and ley-lines numbered so that sets of them can be stored as
+    integer bitmasks.
+
+    The board is a triangle of side_length + 2 cells with its 3 corners
+    removed. Its ley-lines are its rows, followed by its down-right diagonals
+    from left to right, followed by its up-right diagonals from right to
+    left.
+
+    Cells are numbered and labelled in reading order. Boards of side length
+    1 to 5 keep the ley-line numbers and the order of cells on each
+    ley-line of the hand-written boards this replaced, since token
+    dictionaries are read by position: those boards listed the down-right
+    diagonal through 'B' as 'E', 'B', 'I' on side length 3, and as the last
+    ley-line on side lengths 4 and 5.
+
+    >>> layout = BoardLayout(3)
+    >>> [layout.labels[cell] for cell in layout.line_cells[7]]
+    ['E', 'B', 'I']
+    >>> layout = BoardLayout(4)
+    >>> [layout.labels[cell] for cell in layout.line_cells[-1]]
+    ['N', 'I', 'E', 'B']
+
+    side_length - the side length of the board
+    labels - the label of each cell, by cell number, in reading order
+    cell_numbers - the cell number of each label
+    line_keys - the key of each ley-line in the board's token dictionary, by
+                ley-line number
+    line_cells - the cell numbers on each ley-line
+    line_masks - the bitmask of the cells on each ley-line
+    cell_lines - the ley-line numbers through each cell
+    all_cells - the bitmask of every cell
+    winning_lines - the number of ley-lines, at least half of them, which a
+                    player wins by capturing
+    zobrist_cells - the random key of each cell claimed by p1 and by p2
+    zobrist_lines - the random key of each ley-line captured by p1 and by p2
+    zobrist_p1_turn - the random key of p1 being the player to move
+    zobrist_base - the random key of the empty board, so that boards with
+                   different side lengths do not share keys
+    symmetries - the cell and ley-line numbers each cell and ley-line is
+                 mapped to by each of the 6 symmetries of the board, starting
+                 with the identity
+    zobrist_turn_images - zobrist_p1_turn under each symmetry, packed by
+                          pack_keys
+    zobrist_cell_images - the keys of the image of each cell under each
+                          symmetry, packed by pack_keys, when claimed by p1
+                          and by p2
+    zobrist_line_images - the keys of the image of each ley-line under each
+                          symmetry, packed by pack_keys, when captured by p1
+                          and by p2
     """
+    side_length: int
+    labels: List[str]
+    cell_numbers: Dict[str, int]
+    line_keys: List[int]
+    line_cells: List[List[int]]
+    line_masks: List[int]
+    cell_lines: List[Tuple[int, ...]]
+    all_cells: int
+    winning_lines: int
+    zobrist_cells: List[Tuple[int, int]]
+    zobrist_lines: List[Tuple[int, int]]
+    zobrist_p1_turn: int
+    zobrist_base: int
+    symmetries: List[Tuple[List[int], List[int]]]
+    zobrist_turn_images: int
+    zobrist_cell_images: List[Tuple[int, int]]
+    zobrist_line_images: List[Tuple[int, int]]
+
+    def __init__(self, side_length: int) -> None:
+        """
+        Initialize the layout of the board with side length side_length.
+
+        >>> layout = BoardLayout(1)
+        >>> layout.labels
+        ['A', 'B', 'C']
+        >>> [[layout.labels[cell] for cell in cells]
+        ...  for cells in layout.line_cells]
+        [['A', 'B'], ['C'], ['C', 'A'], ['B'], ['B', 'C'], ['A']]
+        """
+        self.side_length = side_length
 
-    def __init__(self, p1_starts: bool) -> None:
+        # Each cell is at column x (in half-cells) of row r. Rows widen by
+        # one cell each until the second last row, which the last row is one
+        # cell narrower than.
+        positions = []
+        for r in range(side_length):
+            positions.extend((side_length + 1 - r + 2 * c, r)
+                             for c in range(r + 2))
+        positions.extend((3 + 2 * c, side_length) for c in range(side_length))
+        self._positions = positions
+
+        self.labels = [cell_label(cell) for cell in range(len(positions))]
+        self.cell_numbers = {label: cell
+                             for cell, label in enumerate(self.labels)}
+        self.line_cells = []
+        self._line_numbers = {}
+        for r in range(side_length + 1):
+            self._add_line(('row', r), [cell for cell in range(len(positions))
+                                        if positions[cell][1] == r])
+        diagonals = sorted({x - r for x, r in positions})
+        for diagonal in diagonals:
+            cells = sorted(
+                [cell for cell in range(len(positions))
+                 if positions[cell][0] - positions[cell][1] == diagonal],
+                key=lambda cell: -positions[cell][1])
+            if diagonal != diagonals[-1]:
+                self._add_line(('down', diagonal), cells)
+            elif side_length == 3:
+                self._add_line(('down', diagonal), cells[1:] + cells[:1])
+            elif 4 <= side_length <= 5:
+                last_cells = cells
+            else:
+                self._add_line(('down', diagonal), cells)
+        for diagonal in sorted({x + r for x, r in positions}, reverse=True):
+            self._add_line(('up', diagonal), [
+                cell for cell in range(len(positions))
+                if positions[cell][0] + positions[cell][1] == diagonal])
+        if 4 <= side_length <= 5:
+            self._add_line(('down', diagonals[-1]), last_cells)
+
+        self.line_keys = list(range(1, len(self.line_cells) + 1))
+        self.line_masks = []
+        for cells in self.line_cells:
+            mask = 0
+            for cell in cells:
+                mask |= 1 << cell
+            self.line_masks.append(mask)
+        self.cell_lines = [tuple(line for line in range(len(self.line_cells))
+                                 if cell in self.line_cells[line])
+                           for cell in range(len(self.labels))]
+        self.all_cells = (1 << len(self.labels)) - 1
+        self.winning_lines = (len(self.line_cells) + 1) // 2
+        self._template, self._slots = self._build_template()
+
+        # Seeded, so that keys are the same in every process.
+        rng = Random(side_length)
+        self.zobrist_cells = [(rng.getrandbits(64), rng.getrandbits(64))
+                              for _ in self.labels]
+        self.zobrist_lines = [(rng.getrandbits(64), rng.getrandbits(64))
+                              for _ in self.line_cells]
+        self.zobrist_p1_turn = rng.getrandbits(64)
+        self.zobrist_base = rng.getrandbits(64)
+
+        self.symmetries = self._find_symmetries()
+        self._mask_tables = [(byte_tables([1 << cell for cell in cell_map]),
+                              byte_tables([1 << line for line in line_map]))
+                             for cell_map, line_map in self.symmetries]
+        self.zobrist_turn_images = pack_keys(
+            [self.zobrist_p1_turn] * len(self.symmetries))
+        self.zobrist_cell_images = [
+            tuple(pack_keys([self.zobrist_cells[cell_map[cell]][player]
+                             for cell_map, _ in self.symmetries])
+                  for player in range(2))
+            for cell in range(len(self.labels))]
+        self.zobrist_line_images = [
+            tuple(pack_keys([self.zobrist_lines[line_map[line]][player]
+                             for _, line_map in self.symmetries])
+                  for player in range(2))
+            for line in range(len(self.line_cells))]
+
+    def _add_line(self, name: Tuple[str, int], cells: List[int]) -> None:
         """
-        Initialize the Stonehenge Game, using p1_starts to find who the first
-        player is.
-        """
-        side_length = int(input("Enter the side length of the board "
-                                "(must be between 1 to 5): "))
-        if side_length == 1:
-            self.tokens = {}
-            for key in BOARD_1:
-                self.tokens[key] = BOARD_1[key].copy()
-        elif side_length == 2:
-            self.tokens = {}
-            for key in BOARD_2:
-                self.tokens[key] = BOARD_2[key].copy()
-        elif side_length == 3:
-            self.tokens = {}
-            for key in BOARD_3:
-                self.tokens[key] = BOARD_3[key].copy()
-        elif side_length == 4:
-            self.tokens = {}
-            for key in BOARD_4:
-                self.tokens[key] = BOARD_4[key].copy()
-        else:
-            self.tokens = {}
-            for key in BOARD_5:
-                self.tokens[key] = BOARD_5[key].copy()
-        self.current_state = StonehengeState(p1_starts, side_length,
-                                             self.tokens)
+        Add the ley-line called name through cells as the next ley-line.
+        """
+        self._line_numbers[name] = len(self.line_cells)
+        self.line_cells.append(cells)
 
-    def get_instructions(self) -> str:
+    def _find_symmetries(self) -> List[Tuple[List[int], List[int]]]:
         """
-        Return the instructions for this a Stonehenge Game.
+        Return the cell and ley-line numbers each cell and ley-line is mapped
+        to by each rotation and reflection of the board, starting with the
+        identity.
+
+        A cell in row t of the full triangle of side N = side_length + 2
+        cells, p cells from its left edge, has barycentric coordinates
+        (t - p, p, N - 1 - t); the symmetries of the triangle permute them.
+
+        >>> [cells for cells, lines in BoardLayout(1).symmetries]
+        [[0, 1, 2], [1, 0, 2], [2, 1, 0], [2, 0, 1], [1, 2, 0], [0, 2, 1]]
         """
-        return "Players take turns claiming cells from the following game " \
-               "board. \nA player that has claimed at least half of the cells" \
-               " in a ley-line, will capture that ley-line. \nOnce a cell or " \
-               "ley-line are claimed, the other player cannot capture either." \
-               " \nThe first player to capture at least half of the ley-lines" \
-               " on the game board is the winner."
+        side_length = self.side_length
+        coordinates = []
+        for x, r in self._positions:
+            t = r + 1
+            p = (x - side_length - 2 + t) // 2
+            coordinates.append((t - p, p, side_length + 1 - t))
+        cell_at = {coordinate: cell
+                   for cell, coordinate in enumerate(coordinates)}
+        line_at = {frozenset(cells): line
+                   for line, cells in enumerate(self.line_cells)}
+
+        symmetries = []
+        for order in [(0, 1, 2), (1, 0, 2), (0, 2, 1), (2, 0, 1), (1, 2, 0),
+                      (2, 1, 0)]:
+            cell_map = [cell_at[tuple(coordinate[i] for i in order)]
+                        for coordinate in coordinates]
+            line_map = [line_at[frozenset(cell_map[cell] for cell in cells)]
+                        for cells in self.line_cells]
+            symmetries.append((cell_map, line_map))
+        return symmetries
+
+    def images(self, p1_cells: int, p2_cells: int, p1_lines: int,
+               p2_lines: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Return the cells and ley-lines each player has claimed in the image of
+        the given claimed cells and ley-lines under each of the symmetries.
+
+        >>> BoardLayout(1).images(0b001, 0b100, 0, 0)[:3]
+        [(1, 4, 0, 0), (2, 4, 0, 0), (4, 1, 0, 0)]
+        """
+        return [(apply_tables(cells, p1_cells), apply_tables(cells, p2_cells),
+                 apply_tables(lines, p1_lines), apply_tables(lines, p2_lines))
+                for cells, lines in self._mask_tables]
 
-    def is_over(self, state: GameState) -> bool:
+    def zobrist_keys(self, p1_turn: bool, p1_cells: int, p2_cells: int,
+                     p1_lines: int, p2_lines: int) -> int:
         """
-        Return whether or not this Stonehenge game is over at state.
+        Return the Zobrist keys of the images of the state with the given
+        player to move and cells and ley-lines claimed under each of the
+        symmetries, starting with the key of the state itself, packed by
+        pack_keys.
         """
-        return state.get_possible_moves() == []
+        return pack_keys([self.zobrist_key(p1_turn, *image) for image in
+                          self.images(p1_cells, p2_cells, p1_lines,
+                                      p2_lines)])
 
-    def is_winner(self, player: str) -> bool:
+    def _build_template(self) -> Tuple[str, List[Tuple[str, int]]]:
+        """
+        Return a format string drawing this board, with a {} for each
+        ley-line marker and cell, and whether each {} (in order) is a 'line'
+        or a 'cell', with its number.
         """
-        Return whether player has won the game.
+        side_length = self.side_length
+        width = max(len(label) for label in self.labels)
+        rows = [{} for _ in range(2 * side_length + 5)]
+
+        def column(x: int) -> int:
+            """
+            Return the text column of half-cell column x.
+            """
+            return x * (width + 1)
+
+        for cell, (x, r) in enumerate(self._positions):
+            y = 2 * r + 2
+            rows[y][column(x)] = ('cell', cell)
+            if r == 0:
+                rows[0][column(x + 1)] = (
+                    'line', self._line_numbers[('up', x + r)])
+                rows[1][column(x + 1) - 1] = '/'
+            if r < side_length - 1:
+                rows[y + 1][column(x) - 1] = '/'
+                rows[y + 1][column(x) + width] = '\\'
+            elif r == side_length - 1:
+                rows[y + 1][column(x) + width] = '\\'
+                if x > 2:
+                    rows[y + 1][column(x) - 1] = '/'
+            else:
+                rows[y + 1][column(x) + width] = '\\'
+                rows[y + 2][column(x + 1)] = (
+                    'line', self._line_numbers[('down', x - r)])
+
+        for r in range(side_length + 1):
+            y = 2 * r + 2
+            cells = self.line_cells[self._line_numbers[('row', r)]]
+            first_x = self._positions[cells[0]][0]
+            last_x = self._positions[cells[-1]][0]
+            rows[y][column(first_x - 2)] = (
+                'line', self._line_numbers[('row', r)])
+            for x in range(first_x - 2, last_x, 2):
+                rows[y][column(x) + width + (width + 1) // 2] = '-'
+            if r < side_length - 1:
+                rows[y][column(last_x + 2)] = (
+                    'line', self._line_numbers[('up', last_x + 2 + r)])
+                rows[y + 1][column(last_x + 2) - 1] = '/'
+            elif r == side_length:
+                rows[y][column(last_x + 2)] = (
+                    'line', self._line_numbers[('down', last_x + 2 - r)])
+
+        lines = []
+        slots = []
+        for row in rows:
+            line = ''
+            position = 0
+            for col in sorted(row):
+                line += ' ' * (col - position)
+                if isinstance(row[col], tuple):
+                    line += '{}'
+                    slots.append(row[col])
+                    position = col + width
+                else:
+                    line += row[col]
+                    position = col + 1
+            lines.append(line)
+        return '\n'.join(lines), slots
+
+    def zobrist_key(self, p1_turn: bool, p1_cells: int, p2_cells: int,
+                    p1_lines: int, p2_lines: int) -> int:
+        """
+        Return the Zobrist key of the state with the given player to move and
+        cells and ley-lines claimed: the XOR of the keys of each of them and
+        of the board.
+        """
+        key = self.zobrist_base
+        if p1_turn:
+            key ^= self.zobrist_p1_turn
+        for player, (cells, lines) in enumerate([(p1_cells, p1_lines),
+                                                 (p2_cells, p2_lines)]):
+            for cell in range(len(self.labels)):
+                if cells >> cell & 1:
+                    key ^= self.zobrist_cells[cell][player]
+            for line in range(len(self.line_cells)):
+                if lines >> line & 1:
+                    key ^= self.zobrist_lines[line][player]
+        return key
+
+    def cell_token(self, cell: int, p1_cells: int, p2_cells: int) -> str:
+        """
+        Return the token shown for cell: '1' or '2' if a player has claimed
+        it, or its label otherwise.
+        """
+        if p1_cells >> cell & 1:
+            return '1'
+        elif p2_cells >> cell & 1:
+            return '2'
+        return self.labels[cell]
+
+    def line_token(self, line: int, p1_lines: int, p2_lines: int) -> str:
+        """
+        Return the token shown for ley-line line: '1' or '2' if a player has
+        captured it, or '@' otherwise.
+        """
+        if p1_lines >> line & 1:
+            return '1'
+        elif p2_lines >> line & 1:
+            return '2'
+        return '@'
+
+    def tokens(self, p1_cells: int = 0, p2_cells: int = 0, p1_lines: int = 0,
+               p2_lines: int = 0) -> Dict[int, List[str]]:
+        """
+        Return a new dictionary mapping each ley-line's key to its token
+        followed by the tokens of its cells, given the cells and ley-lines
+        each player has claimed.
 
-        Precondition: player is 'p1' or 'p2'.
+        >>> BoardLayout(1).tokens()
+        {1: ['@', 'A', 'B'], 2: ['@', 'C'], 3: ['@', 'C', 'A'], \
+4: ['@', 'B'], 5: ['@', 'B', 'C'], 6: ['@', 'A']}
         """
-        return (self.current_state.get_current_player_name() != player
-                and self.is_over(self.current_state))
+        return {key: [self.line_token(line, p1_lines, p2_lines)]
+                + [self.cell_token(cell, p1_cells, p2_cells)
+                   for cell in self.line_cells[line]]
+                for line, key in enumerate(self.line_keys)}
+
+    def render(self, p1_cells: int = 0, p2_cells: int = 0,
+               p1_lines: int = 0, p2_lines: int = 0) -> str:
+        """
+        Return the board drawn as text, given the cells and ley-lines each
+        player has claimed.
+
+        >>> print(BoardLayout(1).render())
+                          @   @
+                         /   /
+                    @ - A - B
+                         \\ / \\
+                      @ - C   @
+                           \\
+                            @
+        """
+        width = max(len(label) for label in self.labels)
+        values = []
+        for kind, number in self._slots:
+            if kind == 'cell':
+                token = self.cell_token(number, p1_cells, p2_cells)
+            else:
+                token = self.line_token(number, p1_lines, p2_lines)
+            values.append(token.ljust(width))
+        lines = [BOARD_INDENT + line.rstrip()
+                 for line in self._template.format(*values).split('\n')]
+        for number, spaces in LEGACY_TRAILING_SPACES.get(self.side_length,
+                                                         {}).items():
+            lines[number] += ' ' * spaces
+        return '\n'.join(lines)
+
+
+def cell_label(number: int) -> str:
+    """
+    Return the label of cell number number: 'A' to 'Z', then 'AA', 'AB' and
+    so on.
+
+    >>> cell_label(0), cell_label(25), cell_label(26), cell_label(52)
+    ('A', 'Z', 'AA', 'BA')
+    """
+    label = ''
+    number += 1
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        label = chr(ord('A') + remainder) + label
+    return label
+
+
+def byte_tables(values: List[int]) -> List[List[int]]:
+    """
+    Return, for each byte of a bitmask over range(len(values)), a table of
+    the XOR of values[i] over the bits i set in each possible value of that
+    byte, for use with apply_tables.
+
+    >>> byte_tables([1, 2, 4])[0][:8]
+    [0, 1, 2, 3, 4, 5, 6, 7]
+    """
+    tables = []
+    for start in range(0, len(values), 8):
+        chunk = values[start:start + 8]
+        table = [0]
+        for value in chunk:
+            table.extend([entry ^ value for entry in table])
+        tables.append(table[:256])
+    return tables
+
+
+def apply_tables(tables: List[List[int]], mask: int) -> int:
+    """
+    Return the XOR of the entries of tables for each byte of mask.
+
+    >>> apply_tables(byte_tables([4, 2, 1]), 0b011)
+    6
+    """
+    result = 0
+    for table in tables:
+        if not mask:
+            break
+        result ^= table[mask & 255]
+        mask >>= 8
+    return result
+
+
+KEY_BITS = 64
+KEY_MASK = (1 << KEY_BITS) - 1
+
+
+def pack_keys(keys: List[int]) -> int:
+    """
+    Return keys, each of KEY_BITS bits, packed into one int with the first
+    key in the lowest bits, so that all of them can be XOR-ed at once.
+
+    One int takes much less memory than a tuple of them.
+
+    >>> pack_keys([1, 2]) == 1 | 2 << KEY_BITS
+    True
+    """
+    packed = 0
+    for i, key in enumerate(keys):
+        packed |= key << (i * KEY_BITS)
+    return packed
+
+
+def smallest_key(packed: int) -> int:
+    """
+    Return the smallest of the 6 keys packed into packed by pack_keys.
+
+    >>> smallest_key(pack_keys([6, 5, 4, 3, 9, 8]))
+    3
+    """
+    return min(packed & KEY_MASK, packed >> KEY_BITS & KEY_MASK,
+               packed >> 2 * KEY_BITS & KEY_MASK,
+               packed >> 3 * KEY_BITS & KEY_MASK,
+               packed >> 4 * KEY_BITS & KEY_MASK,
+               packed >> 5 * KEY_BITS & KEY_MASK)
+
+
+_LAYOUTS = {}
+
+
+def get_layout(side_length: int) -> BoardLayout:
+    """
+    Return the BoardLayout of the board with side length side_length, which
+    is only built the first time it is asked for.
+    """
+    if side_length not in _LAYOUTS:
+        _LAYOUTS[side_length] = BoardLayout(side_length)
+    return _LAYOUTS[side_length]
+
+
+class StonehengeGame(Game):
+    """
+    A class to represent a Stonehenge game.
+    """
+
+    def __init__(self, p1_starts: bool,
+                 side_length: Optional[int] = None) -> None:
+        """
+        Initialize the Stonehenge Game, using p1_starts to find who the first
+        player is, on a board with side length side_length. The user is asked
+        for the side length if it is not given.
+        """
+        if side_length is None:
+            side_length = int(input("Enter the side length of the board "
+                                    "(must be at least 1): "))
+        self.tokens = get_layout(side_length).tokens()
+        self.current_state = StonehengeState(p1_starts, side_length,
+                                             self.tokens)
+
+    def get_instructions(self) -> str:
+        """
+        Return the instructions for this a Stonehenge Game.
+        """
+        return "Players take turns claiming cells from the following " \
+               "game board. \nA player that has claimed at least half of " \
+               "the cells in a ley-line, will capture that ley-line. \nOnce " \
+               "a cell or ley-line are claimed, the other player cannot " \
+               "capture either. \nThe first player to capture at least half " \
+               "of the ley-lines on the game board is the winner."
 
     def str_to_move(self, string: str) -> Any:
         """
         Return the move that string represents. If string is not a move,
         return some invalid move.
         """
-        string.strip()
-        if len(string) != 1 or type(string) != str or string.islower():
+        if not isinstance(string, str):
+            return -1
+        string = string.strip()
+        if not string.isalpha() or not string.isupper():
             return -1
-        return str(string)
+        return string
 
 
 class StonehengeState(GameState):
     """
     The state of a Stonehenge game at a certain point in time.
+
+    The claimed cells and captured ley-lines of each player are stored as
+    bitmasks over the cell and ley-line numbers of the board's BoardLayout,
+    along with the number of ley-lines each player has captured and of cells
+    left unclaimed, so that whether the game is over is found without
+    counting them. Its rough_outcome() is kept once it has been found.
     """
+    side_length: int
+    _layout: BoardLayout
+    _p1_cells: int
+    _p2_cells: int
+    _p1_lines: int
+    _p2_lines: int
+    _p1_line_count: int
+    _p2_line_count: int
+    _free_cell_count: int
+    _zobrists: int
+    _board: Optional[str]
+    _rough_outcome: Optional[int]
+    _history: Optional[List[Tuple[int, ...]]]
+
+    __slots__ = ('side_length', '_layout', '_p1_cells', '_p2_cells',
+                 '_p1_lines', '_p2_lines', '_p1_line_count', '_p2_line_count',
+                 '_free_cell_count', '_zobrists', '_board', '_rough_outcome',
+                 '_history')
 
     def __init__(self, is_p1_turn: bool, side_length: int,
-                 tokens: Dict[int, List[str]]) -> None:
+                 tokens: Optional[Dict[int, List[str]]] = None) -> None:
         """
         Initialize this game state and set the current player based on
         is_p1_turn.
 
+        tokens maps each ley-line to its owner ('@', '1' or '2') followed by
+        its cells, each a label or the player ('1' or '2') who claimed it. If
+        tokens is not given, the board is empty.
         """
         super().__init__(is_p1_turn)
         self.side_length = side_length
-        self.tokens = tokens
-        if side_length == 1:
-            self.board = \
-                """\
-                  {}   {}
-                 /   /
-            {} - {} - {}
-                 \\ / \\
-              {} - {}   {}
-                   \\
-                    {}""".format(self.tokens[6][0], self.tokens[5][0],
-                                 self.tokens[1][0], self.tokens[1][1],
-                                 self.tokens[1][2], self.tokens[2][0],
-                                 self.tokens[2][1], self.tokens[4][0],
-                                 self.tokens[3][0])
-        elif side_length == 2:
-            self.board = \
-                """\
-                    {}   {}
-                   /   /
-              {} - {} - {}   {}
-                 / \\ / \\ /
-            {} - {} - {} - {}
-                 \\ / \\ / \\
-              {} - {} - {}   {}
-                   \\   \\
-                    {}   {}""".format(self.tokens[9][0], self.tokens[8][0],
-                                      self.tokens[1][0], self.tokens[1][1],
-                                      self.tokens[1][2], self.tokens[7][0],
-                                      self.tokens[2][0], self.tokens[2][1],
-                                      self.tokens[2][2], self.tokens[2][3],
-                                      self.tokens[3][0], self.tokens[3][1],
-                                      self.tokens[3][2], self.tokens[6][0],
-                                      self.tokens[4][0], self.tokens[5][0])
-
-        elif side_length == 3:
-            self.board = \
-                """\
-                      {}   {}
-                     /   /
-                {} - {} - {}   {}
-                   / \\ / \\ /
-              {} - {} - {} - {}   {}
-                 / \\ / \\ / \\ /
-            {} - {} - {} - {} - {}
-                 \\ / \\ / \\ / \\
-              {} - {} - {} - {}   {}
-                   \\   \\   \\
-                    {}   {}   {}""".format(self.tokens[12][0],
-                                           self.tokens[11][0],
-                                           self.tokens[1][0],
-                                           self.tokens[1][1],
-                                           self.tokens[1][2],
-                                           self.tokens[10][0],
-                                           self.tokens[2][0],
-                                           self.tokens[2][1],
-                                           self.tokens[2][2],
-                                           self.tokens[2][3],
-                                           self.tokens[9][0],
-                                           self.tokens[3][0],
-                                           self.tokens[3][1],
-                                           self.tokens[3][2],
-                                           self.tokens[3][3],
-                                           self.tokens[3][4],
-                                           self.tokens[4][0],
-                                           self.tokens[4][1],
-                                           self.tokens[4][2],
-                                           self.tokens[4][3],
-                                           self.tokens[8][0],
-                                           self.tokens[5][0],
-                                           self.tokens[6][0],
-                                           self.tokens[7][0])
-
-        elif side_length == 4:
-            self.board = \
-                """\
-                        {}   {}
-                       /   /
-                  {} - {} - {}   {}
-                     / \\ / \\ /
-                {} - {} - {} - {}   {}
-                   / \\ / \\ / \\ /
-              {} - {} - {} - {} - {}   {}
-                 / \\ / \\ / \\ / \\ /
-            {} - {} - {} - {} - {} - {} 
-                 \\ / \\ / \\ / \\ / \\
-              {} - {} - {} - {} - {}   {}
-                   \\   \\   \\   \\
-                    {}   {}   {}   {}""".format(self.tokens[14][0],
-                                                self.tokens[13][0],
-                                                self.tokens[1][0],
-                                                self.tokens[1][1],
-                                                self.tokens[1][2],
-                                                self.tokens[12][0],
-                                                self.tokens[2][0],
-                                                self.tokens[2][1],
-                                                self.tokens[2][2],
-                                                self.tokens[2][3],
-                                                self.tokens[11][0],
-                                                self.tokens[3][0],
-                                                self.tokens[3][1],
-                                                self.tokens[3][2],
-                                                self.tokens[3][3],
-                                                self.tokens[3][4],
-                                                self.tokens[10][0],
-                                                self.tokens[4][0],
-                                                self.tokens[4][1],
-                                                self.tokens[4][2],
-                                                self.tokens[4][3],
-                                                self.tokens[4][4],
-                                                self.tokens[4][5],
-                                                self.tokens[5][0],
-                                                self.tokens[5][1],
-                                                self.tokens[5][2],
-                                                self.tokens[5][3],
-                                                self.tokens[5][4],
-                                                self.tokens[15][0],
-                                                self.tokens[6][0],
-                                                self.tokens[7][0],
-                                                self.tokens[8][0],
-                                                self.tokens[9][0])
-        else:
-            self.board = \
-                """\
-                          {}   {}
-                         /   /
-                    {} - {} - {}   {}           
-                       / \\ / \\ /
-                  {} - {} - {} - {}   {}
-                     / \\ / \\ / \\ /
-                {} - {} - {} - {} - {}   {}
-                   / \\ / \\ / \\ / \\ /
-              {} - {} - {} - {} - {} - {}   {}
-                 / \\ / \\ / \\ / \\ / \\ /
-            {} - {} - {} - {} - {} - {} - {}
-                 \\ / \\ / \\ / \\ / \\ / \\
-              {} - {} - {} - {} - {} - {}   {} 
-                   \\   \\   \\   \\   \\
-                    {}   {}   {}   {}   {}""".format(self.tokens[17][0],
-                                                     self.tokens[16][0],
-                                                     self.tokens[1][0],
-                                                     self.tokens[1][1],
-                                                     self.tokens[1][2],
-                                                     self.tokens[15][0],
-                                                     self.tokens[2][0],
-                                                     self.tokens[2][1],
-                                                     self.tokens[2][2],
-                                                     self.tokens[2][3],
-                                                     self.tokens[14][0],
-                                                     self.tokens[3][0],
-                                                     self.tokens[3][1],
-                                                     self.tokens[3][2],
-                                                     self.tokens[3][3],
-                                                     self.tokens[3][4],
-                                                     self.tokens[13][0],
-                                                     self.tokens[4][0],
-                                                     self.tokens[4][1],
-                                                     self.tokens[4][2],
-                                                     self.tokens[4][3],
-                                                     self.tokens[4][4],
-                                                     self.tokens[4][5],
-                                                     self.tokens[12][0],
-                                                     self.tokens[5][0],
-                                                     self.tokens[5][1],
-                                                     self.tokens[5][2],
-                                                     self.tokens[5][3],
-                                                     self.tokens[5][4],
-                                                     self.tokens[5][5],
-                                                     self.tokens[5][6],
-                                                     self.tokens[6][0],
-                                                     self.tokens[6][1],
-                                                     self.tokens[6][2],
-                                                     self.tokens[6][3],
-                                                     self.tokens[6][4],
-                                                     self.tokens[6][5],
-                                                     self.tokens[18][0],
-                                                     self.tokens[7][0],
-                                                     self.tokens[8][0],
-                                                     self.tokens[9][0],
-                                                     self.tokens[10][0],
-                                                     self.tokens[11][0])
+        self._layout = get_layout(side_length)
+        self._p1_cells = self._p2_cells = 0
+        self._p1_lines = self._p2_lines = 0
+        self._board = None
+        self._rough_outcome = None
+        self._history = None
+        if tokens is not None:
+            self._read_tokens(tokens)
+        self._p1_line_count = self._p1_lines.bit_count()
+        self._p2_line_count = self._p2_lines.bit_count()
+        self._free_cell_count = len(self._layout.labels) - (
+            self._p1_cells | self._p2_cells).bit_count()
+        self._zobrists = self._layout.zobrist_keys(
+            is_p1_turn, self._p1_cells, self._p2_cells, self._p1_lines,
+            self._p2_lines)
+
+    def _read_tokens(self, tokens: Dict[int, List[str]]) -> None:
+        """
+        Claim the cells and ley-lines which tokens shows as claimed.
+        """
+        for line, key in enumerate(self._layout.line_keys):
+            if tokens[key][0] == '1':
+                self._p1_lines |= 1 << line
+            elif tokens[key][0] == '2':
+                self._p2_lines |= 1 << line
+            for cell, token in zip(self._layout.line_cells[line],
+                                   tokens[key][1:]):
+                if token == '1':
+                    self._p1_cells |= 1 << cell
+                elif token == '2':
+                    self._p2_cells |= 1 << cell
+
+    @property
+    def board(self) -> str:
+        """
+        Return this state's board as a string, which is only formatted the
+        first time it is asked for.
+        """
+        if self._board is None:
+            self._board = self._layout.render(self._p1_cells, self._p2_cells,
+                                              self._p1_lines, self._p2_lines)
+        return self._board
+
+    @property
+    def tokens(self) -> Dict[int, List[str]]:
+        """
+        Return a new dictionary mapping each ley-line to its owner ('@', '1'
+        or '2') followed by its cells, each a label or the player ('1' or
+        '2') who claimed it.
+        """
+        return self._layout.tokens(self._p1_cells, self._p2_cells,
+                                   self._p1_lines, self._p2_lines)
+
+    def _successor(self, p1_cells: int, p2_cells: int, p1_lines: int,
+                   p2_lines: int, p1_line_count: int, p2_line_count: int,
+                   free_cell_count: int,
+                   zobrists: int) -> 'StonehengeState':
+        """
+        Return the state of this board with the other player to move, the
+        given claimed cells and captured ley-lines, their counts, and the
+        Zobrist keys zobrists of its images under the symmetries of the
+        board, packed by pack_keys.
+        """
+        new_state = StonehengeState.__new__(StonehengeState)
+        GameState.__init__(new_state, not self.p1_turn)
+        new_state.side_length = self.side_length
+        new_state._layout = self._layout
+        new_state._p1_cells = p1_cells
+        new_state._p2_cells = p2_cells
+        new_state._p1_lines = p1_lines
+        new_state._p2_lines = p2_lines
+        new_state._p1_line_count = p1_line_count
+        new_state._p2_line_count = p2_line_count
+        new_state._free_cell_count = free_cell_count
+        new_state._zobrists = zobrists
+        new_state._board = None
+        new_state._rough_outcome = None
+        new_state._history = None
+        return new_state
 
     def __str__(self) -> str:
         """
@@ -320,96 +670,351 @@ class StonehengeState(GameState):
         """
         return self.board
 
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        """
+        Return how to pickle this state: as its side length, claimed cells,
+        captured ley-lines and their counts, without its BoardLayout, which
+        get_layout() finds again when it is unpickled, or the board, rough
+        outcome and moves to undo it keeps.
+
+        >>> import pickle
+        >>> state = StonehengeState(True, 3).make_move('A')
+        >>> len(pickle.dumps(state)) < 200
+        True
+        >>> copy = pickle.loads(pickle.dumps(state))
+        >>> copy == state, copy.canonical_key() == state.canonical_key()
+        (True, True)
+        """
+        return (_unpickle_state, (
+            self.p1_turn, self.side_length, self._p1_cells, self._p2_cells,
+            self._p1_lines, self._p2_lines, self._p1_line_count,
+            self._p2_line_count, self._free_cell_count))
+
     def get_possible_moves(self) -> list:
         """
         Return all possible moves that can be applied to this state.
         """
+        if self.is_terminal():
+            return []
+        labels = self._layout.labels
+        free_cells = self._layout.all_cells & ~(self._p1_cells
+                                                | self._p2_cells)
         possible_moves = []
-        # check if a game is over
-        if self.p1_turn:
-            count = 0
-            for ley_line in self.tokens:
-                if self.tokens[ley_line][0] == '2':
-                    count += 1
-            if count >= (len(self.tokens) / 2):
-                return possible_moves
-        else:
-            count = 0
-            for ley_line in self.tokens:
-                if self.tokens[ley_line][0] == '1':
-                    count += 1
-            if count >= (len(self.tokens) / 2):
-                return possible_moves
-
-        # if game is not over then get possible moves
-        for ley_line in self.tokens:
-            for token in self.tokens[ley_line]:
-                if token != '@' and token != '1' and token != '2' and token not\
-                        in possible_moves:
-                    possible_moves.append(token)
+        while free_cells:
+            lowest = free_cells & -free_cells
+            possible_moves.append(labels[lowest.bit_length() - 1])
+            free_cells ^= lowest
         return possible_moves
 
     def make_move(self, move: Any) -> 'GameState':
         """
         Return the GameState that results from applying move to this GameState.
         """
-        tokens = {}
-        for key in self.tokens:
-            tokens[key] = self.tokens[key].copy()
+        return self._successor(*self._after_move(move))
+
+    def apply_move(self, move: Any) -> None:
+        """
+        Apply move to this state itself, so that it can be taken back with
+        undo_move().
+
+        >>> state = StonehengeState(True, 1)
+        >>> state.apply_move('A')
+        >>> state == StonehengeState(True, 1).make_move('A')
+        True
+        >>> state.undo_move()
+        >>> state == StonehengeState(True, 1)
+        True
+        """
+        if self._history is None:
+            self._history = []
+        self._history.append((self._p1_cells, self._p2_cells, self._p1_lines,
+                              self._p2_lines, self._p1_line_count,
+                              self._p2_line_count, self._free_cell_count,
+                              self._zobrists))
+        (self._p1_cells, self._p2_cells, self._p1_lines, self._p2_lines,
+         self._p1_line_count, self._p2_line_count, self._free_cell_count,
+         self._zobrists) = self._after_move(move)
+        self.p1_turn = not self.p1_turn
+        self._board = None
+        self._rough_outcome = None
+
+    def undo_move(self) -> None:
+        """
+        Take back the last move applied with apply_move() which has not been
+        taken back yet.
+        """
+        (self._p1_cells, self._p2_cells, self._p1_lines, self._p2_lines,
+         self._p1_line_count, self._p2_line_count, self._free_cell_count,
+         self._zobrists) = self._history.pop()
+        self.p1_turn = not self.p1_turn
+        self._board = None
+        self._rough_outcome = None
+
+    def _after_move(self, move: Any) -> Tuple[int, int, int, int, int, int,
+                                              int, int]:
+        """
+        Return the claimed cells, captured ley-lines, their counts and packed
+        Zobrist keys of the state after move is made from this one, as the
+        arguments of _successor.
+        """
+        layout = self._layout
+        p1_cells, p2_cells = self._p1_cells, self._p2_cells
+        p1_lines, p2_lines = self._p1_lines, self._p2_lines
+        p1_line_count = self._p1_line_count
+        p2_line_count = self._p2_line_count
+        zobrists = self._zobrists ^ layout.zobrist_turn_images
+        cell = layout.cell_numbers.get(move)
+        if cell is None or (p1_cells | p2_cells) >> cell & 1:
+            return (p1_cells, p2_cells, p1_lines, p2_lines, p1_line_count,
+                    p2_line_count, self._free_cell_count, zobrists)
+
+        # Only the ley-lines through the claimed cell can be captured.
+        player = 0 if self.p1_turn else 1
         if self.p1_turn:
-            new_token = '1'
+            p1_cells |= 1 << cell
+            mine = p1_cells
         else:
-            new_token = '2'
-
-        for ley_line in tokens:
-            for i in range(len(tokens[ley_line])):
-                if tokens[ley_line][i] == move:
-                    tokens[ley_line][i] = new_token
-
-        for ley_line in tokens:
-            count = 0
-            for i in range(len(tokens[ley_line])):
-                if tokens[ley_line][i] == new_token:
-                    count += 1
-            if count >= ((len(tokens[ley_line]) - 1)/2) \
-                    and tokens[ley_line][0] == '@':
-                tokens[ley_line][0] = new_token
+            p2_cells |= 1 << cell
+            mine = p2_cells
+        zobrists ^= layout.zobrist_cell_images[cell][player]
+        captured = 0
+        captured_count = 0
+        for line in layout.cell_lines[cell]:
+            if not (p1_lines | p2_lines) >> line & 1 and \
+                    (mine & layout.line_masks[line]).bit_count() * 2 >= \
+                    len(layout.line_cells[line]):
+                captured |= 1 << line
+                captured_count += 1
+                zobrists ^= layout.zobrist_line_images[line][player]
         if self.p1_turn:
-            return StonehengeState(False, self.side_length, tokens)
-        return StonehengeState(True, self.side_length, tokens)
+            p1_lines |= captured
+            p1_line_count += captured_count
+        else:
+            p2_lines |= captured
+            p2_line_count += captured_count
+        return (p1_cells, p2_cells, p1_lines, p2_lines, p1_line_count,
+                p2_line_count, self._free_cell_count - 1, zobrists)
+
+    def move_prior(self, move: Any) -> int:
+        """
+        Return twice the number of ley-lines claiming the cell move would
+        capture for the current player, plus the number of ley-lines claiming
+        it would stop the other player capturing with their next move.
+
+        >>> state = StonehengeState(True, 2)
+        >>> for move in ['A', 'G', 'B']:
+        ...     state = state.make_move(move)
+        >>> state.move_prior('D'), state.move_prior('E')
+        (3, 0)
+        """
+        layout = self._layout
+        cell = layout.cell_numbers.get(move)
+        if cell is None:
+            return 0
+        if self.p1_turn:
+            mine, theirs = self._p1_cells, self._p2_cells
+        else:
+            mine, theirs = self._p2_cells, self._p1_cells
+        captured = self._p1_lines | self._p2_lines
+        prior = 0
+        for line in layout.cell_lines[cell]:
+            if not captured >> line & 1:
+                needed = len(layout.line_cells[line])
+                mask = layout.line_masks[line]
+                if ((mine & mask).bit_count() + 1) * 2 >= needed:
+                    prior += 2
+                elif ((theirs & mask).bit_count() + 1) * 2 >= needed:
+                    prior += 1
+        return prior
+
+    def is_terminal(self) -> bool:
+        """
+        Return whether the game is over at this state: the player who just
+        moved has captured at least half of the ley-lines, or every cell has
+        been claimed.
+        """
+        last_count = self._p2_line_count if self.p1_turn else \
+            self._p1_line_count
+        return (last_count >= self._layout.winning_lines
+                or self._free_cell_count == 0)
+
+    def terminal_score(self) -> int:
+        """
+        Return the score of the current player at this state, which has lost
+        since the other player made the last move.
+
+        Precondition: self.is_terminal()
+        """
+        return self.LOSE
 
     def __repr__(self) -> Any:
         """
         Return a representation of this state (which can be used for
         equality testing).
         """
-        if self.p1_turn:
-            representation = "It is currently player one's turn and the state" \
-                             " of the game is {}".format(self.board)
-        else:
-            representation = "It is currently player two's turn and the state" \
-                             " of the game is {}".format(self.board)
-        return representation
+        return "StonehengeState(p1_turn={}, side_length={}, p1_cells={}, " \
+               "p2_cells={}, p1_lines={}, p2_lines={})".format(
+                   self.p1_turn, self.side_length, self._p1_cells,
+                   self._p2_cells, self._p1_lines, self._p2_lines)
+
+    def zobrist_key(self) -> int:
+        """
+        Return the Zobrist key of this state, which make_move updates by
+        XOR-ing in the claimed cell, any captured ley-lines and the change
+        of player.
+        """
+        return self._zobrists & KEY_MASK
+
+    def state_key(self) -> Any:
+        """
+        Return a hashable key which identifies this state.
+        """
+        return (self.p1_turn, self.side_length, self._p1_cells,
+                self._p2_cells, self._p1_lines, self._p2_lines)
+
+    def canonical_key(self) -> int:
+        """
+        Return the smallest Zobrist key of this state's images under the
+        rotations and reflections of the board, whose keys make_move updates
+        along with zobrist_key().
+        """
+        return smallest_key(self._zobrists)
+
+    def canonical_state(self) -> 'StonehengeState':
+        """
+        Return the image of this state under the rotations and reflections of
+        the board whose claimed cells and ley-lines, as (p1_cells, p2_cells,
+        p1_lines, p2_lines), are lexicographically smallest.
+
+        >>> state_a = StonehengeState(True, 1).make_move('A')
+        >>> state_b = StonehengeState(True, 1).make_move('B')
+        >>> state_a == state_b
+        False
+        >>> state_a.canonical_state() == state_b.canonical_state()
+        True
+        """
+        p1_cells, p2_cells, p1_lines, p2_lines = min(self._layout.images(
+            self._p1_cells, self._p2_cells, self._p1_lines, self._p2_lines))
+        new_state = self._successor(
+            p1_cells, p2_cells, p1_lines, p2_lines, self._p1_line_count,
+            self._p2_line_count, self._free_cell_count,
+            self._layout.zobrist_keys(self.p1_turn, p1_cells, p2_cells,
+                                      p1_lines, p2_lines))
+        new_state.p1_turn = self.p1_turn
+        return new_state
 
     def rough_outcome(self) -> float:
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
-        player can guarantee from state self.
+        player can guarantee from state self: WIN if they can win with their
+        next move, LOSE if the game is over or every move they have lets the
+        other player win with the move after, and DRAW otherwise.
+
+        Only the ley-lines through each unclaimed cell are looked at, instead
+        of making every move and reply, and the outcome is only found the
+        first time it is asked for.
+
+        >>> state = StonehengeState(True, 1)
+        >>> state.rough_outcome() == state.WIN
+        True
+        >>> state = StonehengeState(True, 2)
+        >>> for move in ['A', 'C', 'D', 'E', 'G']:
+        ...     state = state.make_move(move)
+        >>> state.rough_outcome() == state.LOSE
+        True
         """
-        player_points = []
+        if self._rough_outcome is None:
+            self._rough_outcome = self._threat_outcome()
+        return self._rough_outcome
 
-        for move in self.get_possible_moves():
-            new_state = self.make_move(move)
-            if new_state.get_possible_moves() == []:
-                return 1
-            else:
-                for move2 in new_state.get_possible_moves():
-                    new_state_2 = new_state.make_move(move2)
-                    player_points = [-1 if new_state_2.get_possible_moves()
-                                     == [] else 0]
-        if all(player_points):
-            return -1
-        return 0
+    def _threat_outcome(self) -> int:
+        """
+        Return the rough_outcome() of this state, found from the ley-lines
+        each unclaimed cell would capture for each player.
+        """
+        if self.is_terminal():
+            return self.terminal_score()
+        # Claiming the last cell ends the game, which the player claiming it
+        # wins.
+        if self._free_cell_count == 1:
+            return self.WIN
+        winning_lines = self._layout.winning_lines
+        if self.p1_turn:
+            mine, theirs = self._p1_cells, self._p2_cells
+            my_count, their_count = self._p1_line_count, self._p2_line_count
+        else:
+            mine, theirs = self._p2_cells, self._p1_cells
+            my_count, their_count = self._p2_line_count, self._p1_line_count
+
+        free_cells = []
+        free = self._layout.all_cells & ~(mine | theirs)
+        while free:
+            lowest = free & -free
+            free_cells.append(lowest.bit_length() - 1)
+            free ^= lowest
+        my_captures = [self._capture_lines(mine, cell) for cell in free_cells]
+        if any(my_count + lines.bit_count() >= winning_lines
+               for lines in my_captures):
+            return self.WIN
+        if self._free_cell_count == 2:
+            return self.LOSE
+
+        # The other player's winning replies, unless the move before them
+        # captures some of the ley-lines they need first.
+        threats = []
+        for cell in free_cells:
+            lines = self._capture_lines(theirs, cell)
+            if their_count + lines.bit_count() >= winning_lines:
+                threats.append((cell, lines))
+        for cell, lines in zip(free_cells, my_captures):
+            if not any(reply != cell and
+                       their_count + (reply_lines & ~lines).bit_count() >=
+                       winning_lines for reply, reply_lines in threats):
+                return self.DRAW
+        return self.LOSE
+
+    def _capture_lines(self, cells: int, cell: int) -> int:
+        """
+        Return the bitmask of the ley-lines which the player who has claimed
+        cells would capture by claiming cell.
+        """
+        layout = self._layout
+        captured = self._p1_lines | self._p2_lines
+        lines = 0
+        for line in layout.cell_lines[cell]:
+            if not captured >> line & 1 and \
+                    ((cells & layout.line_masks[line]).bit_count() + 1) * 2 \
+                    >= len(layout.line_cells[line]):
+                lines |= 1 << line
+        return lines
+
+
+def _unpickle_state(p1_turn: bool, side_length: int, p1_cells: int,
+                    p2_cells: int, p1_lines: int, p2_lines: int,
+                    p1_line_count: int, p2_line_count: int,
+                    free_cell_count: int) -> StonehengeState:
+    """
+    Return the state a pickled StonehengeState was, from the fields its
+    __reduce__() pickles.
+    """
+    layout = get_layout(side_length)
+    state = StonehengeState.__new__(StonehengeState)
+    GameState.__init__(state, p1_turn)
+    state.side_length = side_length
+    state._layout = layout
+    state._p1_cells = p1_cells
+    state._p2_cells = p2_cells
+    state._p1_lines = p1_lines
+    state._p2_lines = p2_lines
+    state._p1_line_count = p1_line_count
+    state._p2_line_count = p2_line_count
+    state._free_cell_count = free_cell_count
+    state._zobrists = layout.zobrist_keys(p1_turn, p1_cells, p2_cells,
+                                          p1_lines, p2_lines)
+    state._board = None
+    state._rough_outcome = None
+    state._history = None
+    return state
 
 
 if __name__ == '__main__':
@@ -0,0 +1,325 @@
+"""
+An endgame tablebase for Stonehenge on boards with side lengths 1 to 3,
+which holds the outcome and a best move of every state reachable from an
+empty board, up to the rotations and reflections of the board, and a
+strategy which looks states up in it before searching.
+
+Run this module to solve the tablebases and write them to disk, where
+get_tablebase() maps them into memory instead of solving them again:
+
+    python stonehenge_tablebase.py [--directory DIRECTORY] [SIDE_LENGTH ...]
+
+NOTE: You do not have to run python-ta on this file.
+"""
+import argparse
+import os
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from stonehenge import BoardLayout, StonehengeState, get_layout
+from strategy import fallback_search, timed, SearchStats
+
+# Larger boards have too many states to solve, and indices too wide for 64
+# bits.
+MAX_SIDE_LENGTH = 3
+
+# The length in bytes of the header of a saved tablebase, which holds its
+# side length and number of states.
+HEADER_SIZE = 16
+
+# The outcome of a state for the player to move is stored in the low 2 bits
+# of its entry, and the cell number of its best move, in the canonical image
+# of the state, in the rest.
+DRAW = 0
+WIN = 1
+LOSE = 2
+
+DEFAULT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def position_index(layout: BoardLayout, p1_turn: bool, p1_cells: int,
+                   p2_cells: int, p1_lines: int, p2_lines: int) -> int:
+    """
+    Return a number which identifies the position with the given player to
+    move, claimed cells and captured ley-lines on the board layout.
+
+    >>> layout = get_layout(1)
+    >>> position_index(layout, True, 0, 0, 0, 0)
+    1
+    >>> position_index(layout, False, 0b001, 0, 0, 0)
+    16
+    """
+    cell_bits = len(layout.labels)
+    line_bits = len(layout.line_cells)
+    index = (p1_lines << line_bits | p2_lines) << cell_bits | p1_cells
+    return ((index << cell_bits | p2_cells) << 1) | p1_turn
+
+
+def canonical_index(state: StonehengeState) -> Tuple[int, int]:
+    """
+    Return the position_index() of the canonical image of state (the one
+    canonical_state() returns), and the number of the symmetry in the
+    layout's symmetries which maps state to it.
+
+    >>> a = StonehengeState(True, 1).make_move('A')
+    >>> b = StonehengeState(True, 1).make_move('B')
+    >>> canonical_index(a)[0] == canonical_index(b)[0]
+    True
+    """
+    p1_turn, side_length, p1_cells, p2_cells, p1_lines, p2_lines = \
+        state.state_key()
+    layout = get_layout(side_length)
+    images = layout.images(p1_cells, p2_cells, p1_lines, p2_lines)
+    symmetry = min(range(len(images)), key=images.__getitem__)
+    return position_index(layout, p1_turn, *images[symmetry]), symmetry
+
+
+class StonehengeTablebase:
+    """
+    The outcome and a best move of every state reachable from an empty
+    Stonehenge board of one side length, up to symmetry.
+
+    The states are stored as two arrays: the canonical_index() of each state
+    in increasing order, so that a state is found by binary search, and the
+    entry of the state at the same position.
+
+    side_length - the side length of the board this tablebase covers
+    """
+    side_length: int
+
+    def __init__(self, side_length: int, indices: Optional[Any] = None,
+                 entries: Optional[Any] = None) -> None:
+        """
+        Initialize the tablebase of boards with side length side_length,
+        solving it unless indices and entries, the arrays of a tablebase
+        already solved, are given.
+
+        >>> tablebase = StonehengeTablebase(1)
+        >>> tablebase.outcome(StonehengeState(True, 1)) == WIN
+        True
+        """
+        if not 1 <= side_length <= MAX_SIDE_LENGTH:
+            raise ValueError("Only boards with side lengths from 1 to {} "
+                             "can be solved.".format(MAX_SIDE_LENGTH))
+        self.side_length = side_length
+        if indices is None:
+            indices, entries = solve(side_length)
+        self._indices = indices
+        self._entries = entries
+        layout = get_layout(side_length)
+        # The cell each cell of a canonical image is mapped back to.
+        self._inverse_cells = []
+        for cell_map, _ in layout.symmetries:
+            inverse = [0] * len(cell_map)
+            for cell, image in enumerate(cell_map):
+                inverse[image] = cell
+            self._inverse_cells.append(inverse)
+
+    def __len__(self) -> int:
+        """
+        Return the number of states in this tablebase.
+        """
+        return len(self._indices)
+
+    def _entry(self, state: StonehengeState) -> Optional[Tuple[int, int]]:
+        """
+        Return the entry of state and the number of the symmetry mapping it
+        to its canonical image, or None if state is not in this tablebase.
+        """
+        if state.side_length != self.side_length:
+            return None
+        index, symmetry = canonical_index(state)
+        position = int(np.searchsorted(self._indices, np.uint64(index)))
+        if position == len(self._indices) or \
+                self._indices[position] != index:
+            return None
+        return int(self._entries[position]), symmetry
+
+    def outcome(self, state: StonehengeState) -> Optional[int]:
+        """
+        Return the outcome of state for the player to move under perfect
+        play: WIN, LOSE or DRAW, or None if state is not in this tablebase.
+        """
+        entry = self._entry(state)
+        return None if entry is None else entry[0] & 3
+
+    def best_move(self, state: StonehengeState) -> Optional[str]:
+        """
+        Return a best move for the player to move at state, or None if the
+        game is over at state or it is not in this tablebase.
+
+        >>> tablebase = StonehengeTablebase(2)
+        >>> state = StonehengeState(True, 2)
+        >>> tablebase.outcome(state) == WIN
+        True
+        >>> move = tablebase.best_move(state)
+        >>> tablebase.outcome(state.make_move(move)) == LOSE
+        True
+        """
+        entry = self._entry(state)
+        if entry is None or state.is_terminal():
+            return None
+        cell = self._inverse_cells[entry[1]][entry[0] >> 2]
+        return get_layout(self.side_length).labels[cell]
+
+    def save(self, path: str) -> None:
+        """
+        Write this tablebase to the file at path: its side length and number
+        of states as 8 byte little-endian integers, then the index of each
+        state as a little-endian 64-bit integer, then each state's entry as
+        a byte.
+        """
+        with open(path, 'wb') as tablebase_file:
+            tablebase_file.write(self.side_length.to_bytes(8, 'little'))
+            tablebase_file.write(len(self).to_bytes(8, 'little'))
+            tablebase_file.write(
+                np.asarray(self._indices, dtype='<u8').tobytes())
+            tablebase_file.write(
+                np.asarray(self._entries, dtype=np.uint8).tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'StonehengeTablebase':
+        """
+        Return the tablebase saved in the file at path, whose arrays are
+        mapped into memory rather than read.
+        """
+        with open(path, 'rb') as tablebase_file:
+            side_length = int.from_bytes(tablebase_file.read(8), 'little')
+            count = int.from_bytes(tablebase_file.read(8), 'little')
+        indices = np.memmap(path, dtype='<u8', mode='r', offset=HEADER_SIZE,
+                            shape=(count,))
+        entries = np.memmap(path, dtype=np.uint8, mode='r',
+                            offset=HEADER_SIZE + 8 * count, shape=(count,))
+        return cls(side_length, indices, entries)
+
+
+def solve(side_length: int) -> Tuple[Any, Any]:
+    """
+    Return the canonical_index() of every state reachable from an empty
+    board with side length side_length, with either player to move first,
+    in increasing order, and the entry of each of those states.
+
+    Claimed cells are never given back, so no state can be reached again
+    from itself, and each state is solved from the states its moves lead to.
+
+    >>> indices, entries = solve(1)
+    >>> len(indices), sorted(int(entry) & 3 for entry in entries)
+    (4, [1, 1, 2, 2])
+    """
+    entries = {}
+    for p1_starts in [True, False]:
+        _solve_state(StonehengeState(p1_starts, side_length), entries)
+    indices = sorted(entries)
+    return (np.array(indices, dtype=np.uint64),
+            np.array([entries[index] for index in indices], dtype=np.uint8))
+
+
+def _solve_state(state: StonehengeState, entries: Dict[int, int]) -> int:
+    """
+    Return the outcome of state for the player to move, adding the entries of
+    it and every state reachable from it which are not yet in entries.
+
+    The best move is the first which leaves the other player lost, otherwise
+    the first which leaves them drawing, otherwise the first move.
+    """
+    index, symmetry = canonical_index(state)
+    entry = entries.get(index)
+    if entry is not None:
+        return entry & 3
+
+    outcome, best_move = LOSE, None
+    if not state.is_terminal():
+        results = [(_solve_state(state.make_move(move), entries), move)
+                   for move in state.get_possible_moves()]
+        for child_outcome, result in [(LOSE, WIN), (DRAW, DRAW), (WIN, LOSE)]:
+            moves = [move for outcome_after, move in results
+                     if outcome_after == child_outcome]
+            if moves != []:
+                outcome, best_move = result, moves[0]
+                break
+
+    cell = 0
+    if best_move is not None:
+        layout = get_layout(state.side_length)
+        cell = layout.symmetries[symmetry][0][layout.cell_numbers[best_move]]
+    entries[index] = outcome | cell << 2
+    return outcome
+
+
+def tablebase_path(side_length: int,
+                   directory: str = DEFAULT_DIRECTORY) -> str:
+    """
+    Return the path of the saved tablebase of side length side_length in
+    directory.
+    """
+    return os.path.join(directory,
+                        'stonehenge_{}.tablebase'.format(side_length))
+
+
+_TABLEBASES = {}
+
+
+def get_tablebase(side_length: int) -> Optional[StonehengeTablebase]:
+    """
+    Return the tablebase of boards with side length side_length, or None if
+    they are too large to solve.
+
+    A tablebase saved in DEFAULT_DIRECTORY is mapped into memory, otherwise
+    it is solved. Either is only done the first time it is asked for.
+    """
+    if not 1 <= side_length <= MAX_SIDE_LENGTH:
+        return None
+    if side_length not in _TABLEBASES:
+        path = tablebase_path(side_length)
+        if os.path.exists(path):
+            _TABLEBASES[side_length] = StonehengeTablebase.load(path)
+        else:
+            _TABLEBASES[side_length] = StonehengeTablebase(side_length)
+    return _TABLEBASES[side_length]
+
+
+@timed
+def tablebase_strategy(game: Any,
+                       stats: Optional[SearchStats] = None) -> Any:
+    """
+    Return a best move for game, looked up in the tablebase if game is
+    Stonehenge on a board small enough to have one, otherwise found by
+    alpha_beta_strategy.
+
+    A move looked up is counted in stats, if it is given, as a table hit.
+    """
+    state = game.current_state
+    if isinstance(state, StonehengeState):
+        tablebase = get_tablebase(state.side_length)
+        move = None if tablebase is None else tablebase.best_move(state)
+        if move is not None:
+            if stats is not None:
+                stats.visit(0)
+                stats.table_hits += 1
+            return move
+    return fallback_search(game, stats)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Solve the tablebases of the side lengths in the command line arguments
+    argv, and save them where get_tablebase() looks for them.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve Stonehenge on small boards and save the results.")
+    parser.add_argument('side_lengths', type=int, nargs='*',
+                        default=list(range(1, MAX_SIDE_LENGTH + 1)),
+                        choices=range(1, MAX_SIDE_LENGTH + 1))
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY,
+                        help="the directory to save the tablebases in")
+    args = parser.parse_args(argv)
+
+    for side_length in args.side_lengths:
+        path = tablebase_path(side_length, args.directory)
+        tablebase = StonehengeTablebase(side_length)
+        tablebase.save(path)
+        print("Side length {}: {} states, {} bytes, written to {}".format(
+            side_length, len(tablebase), os.path.getsize(path), path))
+
+
+if __name__ == '__main__':
+    main()
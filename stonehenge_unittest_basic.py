@@ -11,7 +11,9 @@ the unittests can properly read. i.e. The ley-lines and cells are in the right
 spots and order; yours **do not** have to be formatted in exactly the same
 way.
 """
+import pickle
 import unittest
+from random import Random
 from unittest.mock import patch
 
 # Import the student solution
@@ -739,6 +741,283 @@ class StonehengeUnitTests(unittest.TestCase):
                           " all moves will result in states where the other " +
                           "player can immediately win but {} was returned " + 
                           "instead.").format(ro))
-        
+
+    @patch('builtins.input', side_effect=['1'])
+    def test_stonehenge_terminal_score(self, input):
+        """
+        Test is_terminal() and terminal_score() on the state reached when p1
+        claims cell 'A' on a board with a side-length of 1.
+        """
+        game = StonehengeGame(True)
+        state = game.current_state
+        self.assertFalse(state.is_terminal())
+        state = state.make_move(game.str_to_move("A"))
+        self.assertTrue(state.is_terminal())
+        self.assertEqual(state.terminal_score(), state.LOSE)
+
+    @patch('builtins.input', side_effect=['2'])
+    def test_stonehenge_tokens_round_trip(self, input):
+        """
+        Test that a state rebuilt from the tokens of another state has the
+        same board and moves.
+        """
+        game = StonehengeGame(True)
+        state = game.current_state
+        for move in ['A', 'G', 'D', 'E']:
+            state = state.make_move(game.str_to_move(move))
+        rebuilt = type(state)(state.p1_turn, state.side_length, state.tokens)
+        self.assertEqual(str(rebuilt), str(state))
+        self.assertEqual(rebuilt.get_possible_moves(),
+                         state.get_possible_moves())
+        self.assertEqual(rebuilt.state_key(), state.state_key())
+
+    @patch('builtins.input', side_effect=['2'])
+    def test_stonehenge_eq_same_value(self, input):
+        """
+        Test that 2 states with the same value and player, reached through
+        different moves, are equal and hash the same, while a state with a
+        different player is not equal to them.
+        """
+        game = StonehengeGame(True)
+        state_1 = game.current_state
+        for move in ['A', 'G', 'B']:
+            state_1 = state_1.make_move(game.str_to_move(move))
+        state_2 = game.current_state
+        for move in ['B', 'G', 'A']:
+            state_2 = state_2.make_move(game.str_to_move(move))
+        self.assertEqual(state_1, state_2)
+        self.assertEqual(hash(state_1), hash(state_2))
+        self.assertEqual(str(state_1), str(state_2))
+        self.assertNotEqual(state_1, type(state_1)(not state_1.p1_turn,
+                                                   state_1.side_length,
+                                                   state_1.tokens))
+
+    def test_stonehenge_hand_written_boards(self):
+        """
+        Test that boards of side lengths 1 to 5 keep the token dictionaries
+        and drawings of the hand-written boards, which read a side-length 3
+        board with 'I' claimed without also claiming 'B'.
+        """
+        state = StonehengeGame(True, 1).current_state
+        self.assertEqual(str(state), "\n".join(
+            " " * 12 + line for line in BOARD_LENGTH_1.split("\n")))
+
+        tokens = StonehengeGame(True, 3).current_state.tokens
+        self.assertEqual(tokens[8], ['@', 'E', 'B', 'I'])
+        tokens[3][4] = tokens[8][3] = tokens[9][1] = '1'
+        state = type(state)(False, 3, tokens)
+        self.assertNotIn('I', state.get_possible_moves())
+        self.assertIn('B', state.get_possible_moves())
+        self.assertEqual(state.tokens, tokens)
+
+        self.assertEqual(StonehengeGame(True, 4).current_state.tokens[15],
+                         ['@', 'N', 'I', 'E', 'B'])
+        self.assertEqual(StonehengeGame(True, 5).current_state.tokens[18],
+                         ['@', 'T', 'N', 'I', 'E', 'B'])
+        lines = str(StonehengeGame(True, 5).current_state).split("\n")
+        self.assertEqual(lines[2], " " * 20 + "@ - A - B   @" + " " * 11)
+
+    @patch('builtins.input', side_effect=['6'])
+    def test_stonehenge_large_board(self, input):
+        """
+        Test that a board with a side-length of 6 has 21 ley-lines and 33
+        cells, labelled past 'Z', and that those cells can be claimed.
+        """
+        game = StonehengeGame(True)
+        ley_lines, cells = self.extract_stonehenge_values(game.current_state)
+        self.assertEqual(ley_lines, ['@'] * 21)
+        self.assertEqual(cells[:3], ['A', 'B', 'C'])
+        self.assertEqual(cells[-7:], ['AA', 'AB', 'AC', 'AD', 'AE', 'AF',
+                                      'AG'])
+        self.assertEqual(game.current_state.get_possible_moves(), cells)
+
+        state = game.current_state.make_move(game.str_to_move("AA"))
+        ley_lines, cells = self.extract_stonehenge_values(state)
+        self.assertEqual(cells[26], '1')
+        self.assertNotIn('AA', state.get_possible_moves())
+
+    @patch('builtins.input', side_effect=['3'])
+    def test_stonehenge_zobrist_key_incremental(self, input):
+        """
+        Test that the Zobrist key make_move updates matches the key of the
+        same state built from its tokens, and that it tells apart states
+        with different players.
+        """
+        game = StonehengeGame(True)
+        state = game.current_state
+        keys = {state.zobrist_key()}
+        for move in ['K', 'A', 'C', 'B', 'F', 'E', 'G']:
+            state = state.make_move(game.str_to_move(move))
+            rebuilt = type(state)(state.p1_turn, state.side_length,
+                                  state.tokens)
+            self.assertEqual(state.zobrist_key(), rebuilt.zobrist_key())
+            self.assertEqual(hash(state), hash(rebuilt))
+            keys.add(state.zobrist_key())
+            other_player = type(state)(not state.p1_turn, state.side_length,
+                                       state.tokens)
+            self.assertNotEqual(state.zobrist_key(),
+                                other_player.zobrist_key())
+        self.assertEqual(len(keys), 8)
+
+    def test_stonehenge_zobrist_key_empty_boards(self):
+        """
+        Test that empty boards of different side lengths, with either
+        player to move, have different, non-zero Zobrist keys.
+        """
+        keys = set()
+        for side_length in range(1, 6):
+            for p1_turn in [True, False]:
+                state = StonehengeGame(p1_turn, side_length).current_state
+                keys.add(state.zobrist_key())
+        self.assertEqual(len(keys), 10)
+        self.assertNotIn(0, keys)
+
+    @patch('builtins.input', side_effect=['2'])
+    def test_stonehenge_symmetric_states(self, input):
+        """
+        Test that states which are reflections or rotations of each other
+        share a canonical_key() and canonical_state(), and that others do not.
+        """
+        game = StonehengeGame(True)
+        start = game.current_state
+        # Each symmetry of the board maps A and B to one of these pairs.
+        corners = [start.make_move(game.str_to_move(move)).make_move(
+            game.str_to_move(reply)) for move, reply in
+                   [('A', 'B'), ('B', 'A'), ('G', 'E'), ('F', 'C'),
+                    ('E', 'G'), ('C', 'F')]]
+        self.assertEqual(len(set(corners)), 6)
+        self.assertEqual(len({state.canonical_key() for state in corners}), 1)
+        self.assertEqual(len({state.canonical_state() for state in corners}),
+                         1)
+        other = start.make_move(game.str_to_move('A')).make_move(
+            game.str_to_move('C'))
+        self.assertNotEqual(other.canonical_key(), corners[0].canonical_key())
+        self.assertNotEqual(other.canonical_state(),
+                            corners[0].canonical_state())
+
+    @patch('builtins.input', side_effect=['3'])
+    def test_stonehenge_apply_undo_move(self, input):
+        """
+        Test that applying moves to a state in place gives the same states,
+        keys and boards as make_move, and that undoing them takes the state
+        back through the same states.
+        """
+        game = StonehengeGame(True)
+        state = game.current_state
+        made = [state.make_move(game.str_to_move('A'))]
+        moves = ['A', 'B', 'L', 'C', 'D', 'E', 'F', 'G', 'H']
+        for move in moves[1:]:
+            made.append(made[-1].make_move(game.str_to_move(move)))
+        for move, expected in zip(moves, made):
+            state.apply_move(game.str_to_move(move))
+            self.assertEqual(state, expected)
+            self.assertEqual(state.zobrist_key(), expected.zobrist_key())
+            self.assertEqual(state.canonical_key(), expected.canonical_key())
+            self.assertEqual(str(state), str(expected))
+            self.assertEqual(state.is_terminal(), expected.is_terminal())
+        for expected in reversed(made[:-1]):
+            state.undo_move()
+            self.assertEqual(state, expected)
+            self.assertEqual(str(state), str(expected))
+        state.undo_move()
+        self.assertEqual(state, StonehengeGame(True, 3).current_state)
+
+    def test_stonehenge_pickle(self):
+        """
+        Test that a state unpickled is the same as the one pickled, with the
+        same keys, board, moves and outcome, and that its pickle does not
+        grow with the board.
+        """
+        for side_length in [1, 3, 5]:
+            state = StonehengeGame(False, side_length).current_state
+            for move in ['A', 'C', 'B', 'E', 'D'][:side_length + 2]:
+                state = state.make_move(move)
+            copy = pickle.loads(pickle.dumps(state))
+            self.assertEqual(copy, state)
+            self.assertEqual(copy.zobrist_key(), state.zobrist_key())
+            self.assertEqual(copy.canonical_key(), state.canonical_key())
+            self.assertEqual(str(copy), str(state))
+            self.assertEqual(copy.get_possible_moves(),
+                             state.get_possible_moves())
+            self.assertEqual(copy.is_terminal(), state.is_terminal())
+            self.assertEqual(copy.rough_outcome(), state.rough_outcome())
+            self.assertLess(len(pickle.dumps(state)), 200)
+
+    def test_stonehenge_is_terminal_counts(self):
+        """
+        Test that is_terminal(), which keeps count of the ley-lines captured
+        and cells claimed as moves are made, agrees with counting them on
+        the board, through random games made and applied in place.
+        """
+        rng = Random(3)
+        for side_length in [1, 2, 3, 4]:
+            for _ in range(10):
+                game = StonehengeGame(rng.random() < 0.5, side_length)
+                state = game.current_state
+                in_place = StonehengeGame(state.p1_turn,
+                                          side_length).current_state
+                while True:
+                    tokens = state.tokens
+                    last_player = '2' if state.p1_turn else '1'
+                    captured = sum(tokens[key][0] == last_player
+                                   for key in tokens)
+                    claimed = all(not token.isalpha() for key in tokens
+                                  for token in tokens[key][1:])
+                    expected = captured * 2 >= len(tokens) or claimed
+                    self.assertEqual(state.is_terminal(), expected)
+                    self.assertEqual(in_place.is_terminal(), expected)
+                    self.assertEqual(game.is_over(state), expected)
+                    rebuilt = type(state)(state.p1_turn, side_length, tokens)
+                    self.assertEqual(rebuilt.is_terminal(), expected)
+                    if expected:
+                        break
+                    move = rng.choice(state.get_possible_moves())
+                    state = state.make_move(move)
+                    in_place.apply_move(move)
+
+    def test_stonehenge_rough_outcome_two_ply(self):
+        """
+        Test that rough_outcome() is 1 exactly when a move wins, -1 exactly
+        when the game is over or every move lets the other player win with
+        their next move, and 0 otherwise, through random games made and
+        applied in place.
+        """
+        def two_ply_outcome(state):
+            if state.is_terminal():
+                return -1
+            states = [state.make_move(move)
+                      for move in state.get_possible_moves()]
+            if any(new_state.is_terminal() for new_state in states):
+                return 1
+            if all(any(new_state.make_move(move).is_terminal()
+                       for move in new_state.get_possible_moves())
+                   for new_state in states):
+                return -1
+            return 0
+
+        rng = Random(4)
+        for side_length in [1, 2, 3, 4]:
+            for _ in range(20):
+                state = StonehengeGame(True, side_length).current_state
+                in_place = StonehengeGame(True, side_length).current_state
+                while True:
+                    expected = two_ply_outcome(state)
+                    self.assertEqual(state.rough_outcome(), expected,
+                                     str(state))
+                    self.assertEqual(state.rough_outcome(), expected)
+                    self.assertEqual(in_place.rough_outcome(), expected)
+                    if state.is_terminal():
+                        break
+                    move = rng.choice(state.get_possible_moves())
+                    state = state.make_move(move)
+                    # The outcome kept for a state changed in place must be
+                    # found again, after both the move and taking it back.
+                    in_place.apply_move(move)
+                    in_place.rough_outcome()
+                    in_place.undo_move()
+                    self.assertEqual(in_place.rough_outcome(), expected)
+                    in_place.apply_move(move)
+
+
 if __name__ == "__main__":
     unittest.main()
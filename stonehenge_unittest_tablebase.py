@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from random import Random
+from unittest.mock import patch
+
+from game_interface import playable_games, usable_strategies
+from stonehenge_tablebase import StonehengeTablebase, get_tablebase, \
+    tablebase_strategy, WIN, LOSE
+from strategy import alpha_beta_helper, alpha_beta_strategy, SearchStats, \
+    TranspositionTable
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+class StonehengeTablebaseUnitTests(unittest.TestCase):
+    def test_outcomes_match_alpha_beta(self):
+        """
+        Test that the tablebase agrees with alpha-beta on the states of
+        random games with side lengths 1 and 2, and that its best move from
+        a won state leaves the other player lost.
+        """
+        rng = Random(0)
+        for side_length in [1, 2]:
+            tablebase = StonehengeTablebase(side_length)
+            table = TranspositionTable()
+            for _ in range(50):
+                state = StonehengeGame(rng.random() < 0.5,
+                                       side_length).current_state
+                while True:
+                    score = alpha_beta_helper(state, -1, 1, table)
+                    outcome = tablebase.outcome(state)
+                    self.assertEqual(outcome, WIN if score == 1 else LOSE,
+                                     repr(state))
+                    if state.is_terminal():
+                        self.assertIsNone(tablebase.best_move(state))
+                        break
+                    move = tablebase.best_move(state)
+                    self.assertIn(move, state.get_possible_moves())
+                    if outcome == WIN:
+                        self.assertEqual(
+                            tablebase.outcome(state.make_move(move)), LOSE)
+                    state = state.make_move(
+                        rng.choice(state.get_possible_moves()))
+
+    def test_save_and_load(self):
+        """
+        Test that a saved tablebase loads with the same states and results.
+        """
+        tablebase = StonehengeTablebase(2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stonehenge_2.tablebase')
+            tablebase.save(path)
+            self.assertEqual(os.path.getsize(path), 16 + 9 * len(tablebase))
+            loaded = StonehengeTablebase.load(path)
+            self.assertEqual((loaded.side_length, len(loaded)),
+                             (2, len(tablebase)))
+            state = StonehengeGame(False, 2).current_state
+            for move in ['G', 'A', 'E']:
+                self.assertEqual(loaded.outcome(state),
+                                 tablebase.outcome(state))
+                self.assertEqual(loaded.best_move(state),
+                                 tablebase.best_move(state))
+                state = state.make_move(move)
+            del loaded
+
+    def test_tablebase_strategy(self):
+        """
+        Test that tablebase_strategy looks moves up on small Stonehenge
+        boards instead of searching, and searches for other games.
+        """
+        game = StonehengeGame(True, 2)
+        stats = SearchStats()
+        move = tablebase_strategy(game, stats=stats)
+        self.assertEqual(
+            get_tablebase(2).outcome(game.current_state.make_move(move)),
+            LOSE)
+        self.assertEqual((stats.nodes, stats.table_hits), (1, 1))
+        self.assertEqual(usable_strategies['tb'](game),
+                         tablebase_strategy(game))
+
+        self.assertIsNone(get_tablebase(4))
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+        self.assertEqual(tablebase_strategy(game),
+                         alpha_beta_strategy(game, TranspositionTable()))
+
+    def test_game_interface_imports_tablebase_lazily(self):
+        """
+        Test that importing game_interface does not import the tablebase
+        module, or numpy with it.
+        """
+        output = subprocess.run(
+            [sys.executable, '-c',
+             "import sys, game_interface; print(sorted({'numpy', "
+             "'stonehenge_tablebase', 'subtract_square_solver'} & "
+             "set(sys.modules)))"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE, universal_newlines=True, check=True)
+        self.assertEqual(output.stdout.strip(), '[]')
+
+    def test_tablebase_strategy_fallback_timing(self):
+        """
+        Test that the time of a search tablebase_strategy falls back to is
+        only counted once in its stats.
+        """
+        with patch('builtins.input', return_value='60'):
+            game = SubtractSquareGame(True)
+        stats = SearchStats()
+        start = time.perf_counter()
+        tablebase_strategy(game, stats=stats)
+        wall_time = time.perf_counter() - start
+        self.assertGreater(stats.nodes, 1)
+        self.assertGreater(stats.seconds, 0.0)
+        self.assertLessEqual(stats.seconds, wall_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
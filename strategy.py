@@ -5,24 +5,62 @@ NOTE: Make sure this file adheres to python-ta.
 Adjust the type annotations as needed, and implement both a recursive
 and an iterative version of minimax.
 """
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from math import log, sqrt
+from functools import wraps
+from random import Random
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def timed(strategy: Callable) -> Callable:
+    """
+    Return strategy, adding the wall time of each call to its stats
+    argument, if one is given.
+    """
+    @wraps(strategy)
+    def timed_strategy(game: Any, *args: Any,
+                       stats: Optional['SearchStats'] = None,
+                       **kwargs: Any) -> Any:
+        """
+        Return strategy(game, *args, stats=stats, **kwargs).
+        """
+        if stats is None:
+            return strategy(game, *args, **kwargs)
+        start = perf_counter()
+        try:
+            return strategy(game, *args, stats=stats, **kwargs)
+        finally:
+            stats.seconds += perf_counter() - start
+    return timed_strategy
+
 
 # TODO: Adjust the type annotation as needed.
 
 
-def interactive_strategy(game: Any) -> Any:
+@timed
+def interactive_strategy(game: Any,
+                         stats: Optional['SearchStats'] = None) -> Any:
     """
     Return a move for game through interactively asking the user for input.
+
+    No states are searched, so stats is left unchanged.
     """
     move = input("Enter a move: ")
     return game.str_to_move(move)
 
 
-def rough_outcome_strategy(game: Any) -> Any:
+@timed
+def rough_outcome_strategy(game: Any,
+                           stats: Optional['SearchStats'] = None) -> Any:
     """
     Return a move for game by picking a move which results in a state with
     the lowest rough_outcome() for the opponent.
 
+    Each state scored is counted in stats, if it is given, along with the
+    time taken.
+
     NOTE: game.rough_outcome() should do the following:
         - For a state that's over, it returns the score for the current
           player of that state.
@@ -41,10 +79,16 @@ def rough_outcome_strategy(game: Any) -> Any:
     current_state = game.current_state
     best_move = None
     best_outcome = -2
+    moves = current_state.get_possible_moves()
+    if stats is not None:
+        stats.visit(0)
+        stats.expand(len(moves))
 
     # Get the move that results in the lowest rough_outcome for the opponent
-    for move in current_state.get_possible_moves():
+    for move in moves:
         new_state = current_state.make_move(move)
+        if stats is not None:
+            stats.visit(1)
 
         # We multiply the below by -1 since a state that's bad for the opponent
         # is good for us.
@@ -59,17 +103,43 @@ def rough_outcome_strategy(game: Any) -> Any:
 # TODO: Implement a recursive version of the minimax strategy.
 
 
-def recursive_minimax_strategy(game: Any) -> Any:
+@timed
+def recursive_minimax_strategy(game: Any,
+                               table: Optional['TranspositionTable'] = None,
+                               stats: Optional['SearchStats'] = None,
+                               in_place: bool = False) -> Any:
     """
     Return a move for a game generated using the minimax strategy.
     This implementation will use recursion.
+
+    Scores of states already searched are looked up in table, which defaults
+    to the module-level TRANSPOSITION_TABLE. The states searched are counted
+    in stats, if it is given, along with the time taken.
+
+    If in_place is True, moves are made and taken back on game.current_state
+    itself with apply_move() and undo_move(), instead of making a new state
+    for each, and it is left as it was once the search is over.
     """
+    if table is None:
+        table = TRANSPOSITION_TABLE
     current_state = game.current_state
     initial_moves = {1: [], -1: [], 0: []}
-    for move in current_state.get_possible_moves():
-        new_state = current_state.make_move(move)
-        initial_moves[-1 * recursive_helper(game, new_state)].append(move)
-        game.current_state = current_state
+    moves = current_state.get_possible_moves()
+    if stats is not None:
+        stats.visit(0)
+        stats.expand(len(moves))
+    for move in moves:
+        if in_place:
+            current_state.apply_move(move)
+            try:
+                score = recursive_helper(game, current_state, table, stats,
+                                         in_place=True)
+            finally:
+                current_state.undo_move()
+        else:
+            score = recursive_helper(game, current_state.make_move(move),
+                                     table, stats)
+        initial_moves[-1 * score].append(move)
     if initial_moves[1] != []:
         return initial_moves[1][0]
     elif initial_moves[0] != []:
@@ -77,93 +147,1143 @@ def recursive_minimax_strategy(game: Any) -> Any:
     return initial_moves[-1][0]
 
 
-def recursive_helper(game: Any, state: Any) -> int:
+def recursive_helper(game: Any, state: Any,
+                     table: Optional['TranspositionTable'] = None,
+                     stats: Optional['SearchStats'] = None,
+                     depth: int = 1, in_place: bool = False) -> int:
     """
     Return the score that a potential move will have for the player.
+
+    If table is given, scores are looked up in and stored to it. If stats is
+    given, each state searched is counted in it, as depth moves from the
+    current state. game is never changed; the score only depends on state.
+    If in_place is True, moves are searched by applying them to state and
+    taking them back again.
     """
-    game.current_state = state
-    if state.get_current_player_name() == 'p1':
-        current_player = 'p1'
-        opponent = 'p2'
+    if stats is not None:
+        stats.visit(depth)
+    if table is not None:
+        score = table.lookup(state)
+        if score is not None:
+            if stats is not None:
+                stats.table_hits += 1
+            return score
+    if state.is_terminal():
+        if stats is not None:
+            stats.terminals += 1
+        score = state.terminal_score()
     else:
-        current_player = 'p2'
-        opponent = 'p1'
-
-    if game.is_over(state):
-        if game.is_winner(current_player):
-            return 1
-        elif game.is_winner(opponent):
-            return -1
-        return 0
-    else:
-        return max([recursive_helper(game, state.make_move(move)) * -1
-                    for move in state.get_possible_moves()])
+        moves = state.get_possible_moves()
+        if stats is not None:
+            stats.expand(len(moves))
+        if in_place:
+            score = -2
+            for move in moves:
+                state.apply_move(move)
+                score = max(score, recursive_helper(game, state, table, stats,
+                                                    depth + 1, True) * -1)
+                state.undo_move()
+        else:
+            score = max([recursive_helper(game, state.make_move(move), table,
+                                          stats, depth + 1) * -1
+                         for move in moves])
+    if table is not None:
+        table.store(state, score)
+    return score
 
 
 # TODO: Implement an iterative version of the minimax strategy.
 
 
-def iterative_minimax_strategy(game: Any) -> Any:
+@timed
+def iterative_minimax_strategy(game: Any,
+                               table: Optional['TranspositionTable'] = None,
+                               stats: Optional['SearchStats'] = None) -> Any:
     """
     Return a move for a game generated using the minimax strategy.
     This implementation will not include recursion.
+
+    The game tree is searched depth first, and each state is dropped as
+    soon as it is scored, so only the states on the path being searched and
+    their siblings are kept at once.
+
+    Scores of states already searched are looked up in table, which defaults
+    to the module-level TRANSPOSITION_TABLE. The states searched are counted
+    in stats, if it is given, along with the time taken.
     """
+    if table is None:
+        table = TRANSPOSITION_TABLE
     state = game.current_state
     s = Stack()
-    possible_moves = {}
+    root_moves = []
     initial_item = PotentialState(state)
     s.add(initial_item)
 
     while not s.is_empty():
         item = s.remove()
-        game.current_state = item.value
         if item.children == []:
-            if game.is_over(item.value):
-                if item.value.p1_turn:
-                    current_player = 'p1'
-                    opponent = 'p2'
-                else:
-                    current_player = 'p2'
-                    opponent = 'p1'
-                if game.is_winner(current_player):
-                    item.score = 1
-                elif game.is_winner(opponent):
-                    item.score = -1
-                else:
-                    item.score = 0
+            if stats is not None:
+                stats.visit(item.depth)
+            cached_score = None
+            if item is not initial_item:
+                cached_score = table.lookup(item.value)
+            if cached_score is not None:
+                if stats is not None:
+                    stats.table_hits += 1
+                item.score = cached_score
+            elif item.value.is_terminal():
+                if stats is not None:
+                    stats.terminals += 1
+                item.score = item.value.terminal_score()
+                table.store(item.value, item.score)
             else:
                 s.add(item)
-                for move in item.value.get_possible_moves():
-                    new_state = item.value.make_move(move)
-                    new_item = PotentialState(new_state)
+                moves = item.value.get_possible_moves()
+                if stats is not None:
+                    stats.expand(len(moves))
+                for move in moves:
+                    new_item = PotentialState(item.value.make_move(move),
+                                              depth=item.depth + 1)
                     item.children.append(new_item)
-                    possible_moves[new_state] = move
+                    if item is initial_item:
+                        root_moves.append(move)
                     s.add(new_item)
         else:
             child_scores = []
             for child in item.children:
                 child_scores.append(child.score * -1)
             item.score = max(child_scores)
+            table.store(item.value, item.score)
 
-    game.current_state = state
-    for child in initial_item.children:
+        # Once it is scored, the parent only needs an item's score, so its
+        # state and children are let go of: only the items on the stack and
+        # the root's children are kept.
+        if item.score is not None and item is not initial_item:
+            item.value = None
+            item.children = []
+
+    for child, move in zip(initial_item.children, root_moves):
         if child.score == -1:
-            return possible_moves[child.value]
-    for child in initial_item.children:
+            return move
+    for child, move in zip(initial_item.children, root_moves):
         if child.score == 0:
-            return possible_moves[child.value]
-    dict_keys = []
-    for key in possible_moves:
-        dict_keys.append(key)
-    return possible_moves[dict_keys[0]]
+            return move
+    return root_moves[0] if root_moves != [] else None
+
+
+@timed
+def alpha_beta_strategy(game: Any,
+                        table: Optional['TranspositionTable'] = None,
+                        stats: Optional['SearchStats'] = None,
+                        in_place: bool = False,
+                        ordering: Optional['MoveOrdering'] = None) -> Any:
+    """
+    Return a move for a game generated using negamax with alpha-beta pruning.
+
+    The move returned is the same one recursive_minimax_strategy would return:
+    the first winning move, otherwise the first drawing move, otherwise the
+    first move. Exact scores are looked up in and stored to table, which
+    defaults to the module-level TRANSPOSITION_TABLE. The states searched are
+    counted in stats, if it is given, along with the time taken.
+
+    If in_place is True, moves are made and taken back on game.current_state
+    itself, as in recursive_minimax_strategy.
+
+    If ordering is given, the moves of every state are searched in the order
+    it gives them, so that the move returned is the first winning (or
+    drawing) move in that order instead.
+    """
+    if table is None:
+        table = TRANSPOSITION_TABLE
+    current_state = game.current_state
+    best_move = None
+    best_score = -2
+    moves = current_state.get_possible_moves()
+    if ordering is not None:
+        moves = ordering.order(current_state, moves, 0)
+    if stats is not None:
+        stats.visit(0)
+        stats.expand(len(moves))
+    for move in moves:
+        alpha = max(best_score, -1)
+        if in_place:
+            current_state.apply_move(move)
+            try:
+                score = -1 * alpha_beta_helper(current_state, -1, -1 * alpha,
+                                               table, stats, 1, True,
+                                               ordering)
+            finally:
+                current_state.undo_move()
+        else:
+            score = -1 * alpha_beta_helper(current_state.make_move(move), -1,
+                                           -1 * alpha, table, stats, 1,
+                                           False, ordering)
+        if best_move is None or score > best_score:
+            best_move = move
+            best_score = score
+        if best_score == 1:
+            break
+    if ordering is not None and best_move is not None:
+        ordering.record_best(current_state, best_move)
+    return best_move
+
+
+def alpha_beta_helper(state: Any, alpha: int, beta: int,
+                      table: Optional['TranspositionTable'] = None,
+                      stats: Optional['SearchStats'] = None,
+                      depth: int = 1, in_place: bool = False,
+                      ordering: Optional['MoveOrdering'] = None) -> int:
+    """
+    Return the score of state for its current player if it lies strictly
+    between alpha and beta. Otherwise, return a bound on that score: at most
+    alpha if the score is at most alpha, and at least beta if the score is at
+    least beta.
+
+    If table is given, exact scores are looked up in and stored to it. If
+    stats is given, each state searched is counted in it, as depth moves
+    from the current state. If in_place is True, moves are searched by
+    applying them to state and taking them back again. If ordering is given,
+    moves are searched in the order it gives them.
+    """
+    if stats is not None:
+        stats.visit(depth)
+    if table is not None:
+        score = table.lookup(state)
+        if score is not None:
+            if stats is not None:
+                stats.table_hits += 1
+            return score
+    if state.is_terminal():
+        if stats is not None:
+            stats.terminals += 1
+        best_score = state.terminal_score()
+    else:
+        best_score = -2
+        best_move = None
+        moves = state.get_possible_moves()
+        if ordering is not None:
+            moves = ordering.order(state, moves, depth)
+        if stats is not None:
+            stats.expand(len(moves))
+        for index, move in enumerate(moves):
+            if in_place:
+                state.apply_move(move)
+                score = -1 * alpha_beta_helper(state, -1 * beta,
+                                               -1 * max(alpha, best_score),
+                                               table, stats, depth + 1, True,
+                                               ordering)
+                state.undo_move()
+            else:
+                score = -1 * alpha_beta_helper(state.make_move(move),
+                                               -1 * beta,
+                                               -1 * max(alpha, best_score),
+                                               table, stats, depth + 1,
+                                               False, ordering)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if best_score >= beta:
+                    record_cutoff(stats, ordering, move, index, depth,
+                                  len(moves))
+                    break
+        if ordering is not None:
+            ordering.record_best(state, best_move)
+    # A bound is only exact when no better (or worse) score is possible.
+    if table is not None and (alpha < best_score < beta
+                              or best_score in (1, -1)):
+        table.store(state, best_score)
+    return best_score
+
+
+def record_cutoff(stats: Optional['SearchStats'],
+                  ordering: Optional['MoveOrdering'], move: Any, index: int,
+                  ply: int, moves: int) -> None:
+    """
+    Count a cutoff made by move, the move at position index of the moves
+    moves searched from a state ply moves from the current state, in stats
+    and ordering, whichever are given.
+    """
+    if stats is not None:
+        stats.cutoff(index)
+    if ordering is not None:
+        ordering.record_cutoff(move, ply, moves)
+
+
+@timed
+def iterative_deepening_strategy(game: Any, time_limit: float = 0.05,
+                                 stats: Optional['SearchStats'] = None,
+                                 ordering: Optional['MoveOrdering'] = None
+                                 ) -> Any:
+    """
+    Return a move for a game found by depth-limited alpha-beta searches of
+    increasing depth, using rough_outcome() to score states at the search
+    horizon.
+
+    Searching stops once time_limit seconds have passed, and the best move of
+    the deepest search that finished is returned. If not even a search of
+    depth 1 finishes, the first possible move is returned. The states
+    searched, at every depth, are counted in stats, if it is given, along
+    with the time taken.
+
+    If ordering is given, the moves of every state are searched in the order
+    it gives them, so each search is guided by the best moves and cutoffs of
+    the shallower searches before it.
+    """
+    deadline = perf_counter() + time_limit
+    current_state = game.current_state
+    moves = current_state.get_possible_moves()
+    best_move = moves[0] if moves else None
+    depth = 1
+    try:
+        while True:
+            # Try the best move found so far first, so it is the one kept
+            # should a later move only tie with it.
+            if ordering is not None:
+                moves = ordering.order(current_state, moves, 0)
+            if best_move in moves:
+                moves.remove(best_move)
+                moves.insert(0, best_move)
+            move, complete = depth_limited_root(current_state, moves, depth,
+                                                deadline, stats, ordering)
+            best_move = move
+            if complete:
+                break
+            depth += 1
+    except SearchTimeout:
+        pass
+    return best_move
+
+
+def depth_limited_root(state: Any, moves: list, depth: int,
+                       deadline: float,
+                       stats: Optional['SearchStats'] = None,
+                       ordering: Optional['MoveOrdering'] = None
+                       ) -> Tuple[Any, bool]:
+    """
+    Return the best of moves from state found by a search depth plies deep,
+    and whether that search reached the end of the game on every line it
+    examined. The states searched are counted in stats, if it is given, and
+    the moves after the first are searched in the order ordering gives them,
+    if it is given.
+
+    Raise SearchTimeout if the search is still running at deadline.
+    """
+    best_move = None
+    best_score = -2.0
+    complete = True
+    if stats is not None:
+        stats.visit(0)
+        stats.expand(len(moves))
+    for move in moves:
+        alpha = max(best_score, -1.0)
+        score, child_complete = depth_limited_helper(
+            state.make_move(move), depth - 1, -1.0, -1 * alpha, deadline,
+            stats, 1, ordering)
+        score *= -1
+        complete = complete and child_complete
+        if best_move is None or score > best_score:
+            best_move = move
+            best_score = score
+        if best_score >= 1:
+            break
+    return best_move, complete
+
+
+def depth_limited_helper(state: Any, depth: int, alpha: float, beta: float,
+                         deadline: float,
+                         stats: Optional['SearchStats'] = None,
+                         ply: int = 1,
+                         ordering: Optional['MoveOrdering'] = None
+                         ) -> Tuple[float, bool]:
+    """
+    Return the alpha-beta score of state for its current player, searching
+    depth more plies and scoring states past that with rough_outcome(), and
+    whether every line examined reached the end of the game. The states
+    searched are counted in stats, if it is given, as ply moves from the
+    current state. Moves are searched in the order ordering gives them, if
+    it is given.
+
+    Raise SearchTimeout if the search is still running at deadline.
+    """
+    if perf_counter() > deadline:
+        raise SearchTimeout
+    if stats is not None:
+        stats.visit(ply)
+    if state.is_terminal():
+        if stats is not None:
+            stats.terminals += 1
+        return float(state.terminal_score()), True
+    if depth <= 0:
+        return state.rough_outcome(), False
+
+    best_score = -2.0
+    best_move = None
+    complete = True
+    moves = state.get_possible_moves()
+    if ordering is not None:
+        moves = ordering.order(state, moves, ply)
+    if stats is not None:
+        stats.expand(len(moves))
+    for index, move in enumerate(moves):
+        score, child_complete = depth_limited_helper(
+            state.make_move(move), depth - 1, -1 * beta,
+            -1 * max(alpha, best_score), deadline, stats, ply + 1, ordering)
+        score *= -1
+        complete = complete and child_complete
+        if score > best_score:
+            best_score = score
+            best_move = move
+            if best_score >= beta:
+                record_cutoff(stats, ordering, move, index, ply, len(moves))
+                break
+    if ordering is not None:
+        ordering.record_best(state, best_move)
+    return best_score, complete
+
+
+def fallback_search(game: Any, stats: Optional['SearchStats'] = None) -> Any:
+    """
+    Return the move alpha_beta_strategy picks for game, for a strategy which
+    is timed itself to fall back to.
+
+    The states searched are counted in stats, if it is given, but not the
+    time taken, which the calling strategy counts.
+    """
+    # alpha_beta_strategy times itself, and must not be timed twice.
+    fallback_stats = None if stats is None else SearchStats()
+    move = alpha_beta_strategy(game, stats=fallback_stats)
+    if stats is not None:
+        fallback_stats.seconds = 0.0
+        stats.merge(fallback_stats)
+    return move
+
+
+# A proof or disproof number larger than any reached in a search: that of a
+# state already disproved or proved.
+PROOF_INFINITY = 10 ** 12
+
+
+@timed
+def proof_number_strategy(game: Any,
+                          table: Optional['TranspositionTable'] = None,
+                          stats: Optional['SearchStats'] = None) -> Any:
+    """
+    Return a winning move for game found by proof_number_search(), or, if
+    the current player cannot win, the move alpha_beta_strategy picks.
+
+    Proof numbers are stored to table, a new TranspositionTable by default.
+    The states searched are counted in stats, if it is given, along with the
+    time taken.
+
+    Precondition: no state of game can be reached again from itself (so
+    this cannot be used on Chopsticks).
+    """
+    won, move = proof_number_search(game.current_state, table, stats)
+    if won:
+        return move
+    return fallback_search(game, stats)
+
+
+def proof_number_search(state: Any,
+                        table: Optional['TranspositionTable'] = None,
+                        stats: Optional['SearchStats'] = None,
+                        max_entries: int = 100000) -> Tuple[bool, Any]:
+    """
+    Return whether the current player of state can force a win from it, and
+    if so, a winning move (otherwise None), found by depth-first
+    proof-number search.
+
+    Each state searched has a proof number, the fewest states which must
+    still be searched to prove the current player of state wins, and a
+    disproof number, the fewest to prove they cannot. The search follows
+    the moves with the smallest of these until one reaches 0, without ever
+    ordering the moves by score. Draws count as failing to win.
+
+    Proof numbers are stored to table, which defaults to a new
+    TranspositionTable of max_entries entries, so memory stays bounded
+    however long the search takes. A table given must only have been used
+    by proof-number searches for the same player. The states searched are
+    counted in stats, if it is given.
+
+    Precondition: no state can be reached again from itself.
+
+    >>> from subtract_square_state import SubtractSquareState
+    >>> proof_number_search(SubtractSquareState(True, 6))
+    (True, 4)
+    >>> proof_number_search(SubtractSquareState(True, 7))
+    (False, None)
+    """
+    if state.is_terminal():
+        if stats is not None:
+            stats.visit(0)
+            stats.terminals += 1
+        return state.terminal_score() == state.WIN, None
+    if table is None:
+        table = TranspositionTable(max_entries)
+    proof, _, move = proof_number_helper(state, state.p1_turn, PROOF_INFINITY,
+                                         PROOF_INFINITY, table, stats)
+    if proof == 0:
+        return True, move
+    return False, None
+
+
+def proof_number_helper(state: Any, p1_proving: bool, proof_limit: int,
+                        disproof_limit: int, table: 'TranspositionTable',
+                        stats: Optional['SearchStats'] = None,
+                        depth: int = 0) -> Tuple[int, int, Any]:
+    """
+    Return the proof and disproof numbers of state, a state where the game
+    is not over, for the claim that p1 wins if p1_proving is True (or that
+    p2 wins, otherwise), and the move with the smallest proof number (if
+    the claimed winner moves next) or disproof number (otherwise).
+
+    The moves of state are searched until its proof number reaches
+    proof_limit or its disproof number reaches disproof_limit. The numbers
+    found are stored to table, and the states searched are counted in
+    stats, if it is given, as depth moves from the current state.
+    """
+    if stats is not None:
+        stats.visit(depth)
+    moves = sorted(state.get_possible_moves(), key=state.move_prior,
+                   reverse=True)
+    # The claimed winner needs one move to win, and the other player all
+    # of theirs to lose, so the roles of the numbers swap between them.
+    proving = state.p1_turn == p1_proving
+    children = []
+    numbers = []
+    for move in moves:
+        child = state.make_move(move)
+        proof, disproof = initial_proof_numbers(child, p1_proving, table,
+                                                stats)
+        children.append(child)
+        numbers.append((proof, disproof) if proving else (disproof, proof))
+        if numbers[-1][0] == 0:
+            # The moves after one which settles the claim do not matter.
+            break
+    if stats is not None:
+        stats.expand(len(children))
+
+    while True:
+        best = 0
+        second_smallest = PROOF_INFINITY
+        total = 0
+        for index, (smallest, other) in enumerate(numbers):
+            if smallest < numbers[best][0]:
+                second_smallest = numbers[best][0]
+                best = index
+            elif index != best and smallest < second_smallest:
+                second_smallest = smallest
+            total = min(total + other, PROOF_INFINITY)
+        smallest, other = numbers[best]
+        if proving:
+            proof, disproof = smallest, total
+            smallest_limit, total_limit = proof_limit, disproof_limit
+        else:
+            proof, disproof = total, smallest
+            smallest_limit, total_limit = disproof_limit, proof_limit
+        if smallest >= smallest_limit or total >= total_limit:
+            break
+
+        # Search the child until it is a quarter larger than the next
+        # smallest, rather than just larger, so that the search does not
+        # keep switching between children with close numbers, or until the
+        # sum passes its limit.
+        limits = (min(smallest_limit,
+                      second_smallest + second_smallest // 4 + 1),
+                  total_limit - total + other)
+        if not proving:
+            limits = limits[::-1]
+        child_proof, child_disproof, _ = proof_number_helper(
+            children[best], p1_proving, limits[0], limits[1], table, stats,
+            depth + 1)
+        numbers[best] = ((child_proof, child_disproof) if proving else
+                         (child_disproof, child_proof))
+
+    table.store(state, (proof, disproof))
+    return proof, disproof, moves[best]
+
+
+def initial_proof_numbers(state: Any, p1_proving: bool,
+                          table: 'TranspositionTable',
+                          stats: Optional['SearchStats'] = None
+                          ) -> Tuple[int, int]:
+    """
+    Return the proof and disproof numbers of state for the claim that p1
+    wins if p1_proving is True (or that p2 wins, otherwise), without
+    searching it: those stored in table, those of a proved or disproved
+    claim if the game is over, and otherwise 1 for the player to move and
+    the number of their moves for the other, since the more moves the
+    player has the more of them the other must refute.
+    """
+    numbers = table.lookup(state)
+    if numbers is not None:
+        if stats is not None:
+            stats.table_hits += 1
+        return numbers
+    if not state.is_terminal():
+        mobility = len(state.get_possible_moves())
+        if state.p1_turn == p1_proving:
+            return 1, mobility
+        return mobility, 1
+    if stats is not None:
+        stats.terminals += 1
+    score = state.terminal_score()
+    if (score == state.WIN) == (state.p1_turn == p1_proving) and \
+            score != state.DRAW:
+        return 0, PROOF_INFINITY
+    return PROOF_INFINITY, 0
+
+
+@timed
+def mcts_strategy(game: Any, iterations: int = 1000,
+                  time_limit: Optional[float] = None,
+                  exploration: float = 1.4, playout: str = 'random',
+                  rng: Optional[Random] = None,
+                  stats: Optional['SearchStats'] = None,
+                  max_playout_moves: int = 200) -> Any:
+    """
+    Return a move for a game found by Monte Carlo Tree Search, using UCT to
+    pick which states to explore.
+
+    The search runs for iterations playouts, or for time_limit seconds if it
+    is given. Each playout either plays random moves (chosen with rng) until
+    the game is over, or, if playout is 'rough', scores the newly explored
+    state with its rough_outcome(). A random playout still going after
+    max_playout_moves moves, as it may forever in a game whose states
+    repeat (e.g. Chopsticks), is scored as a draw. The move explored most
+    often is returned.
+
+    The states explored and played through are counted in stats, if it is
+    given, along with the time taken. A state is counted as expanded once
+    all of its moves have been tried.
+    """
+    if rng is None:
+        rng = Random()
+    current_state = game.current_state
+    root = MCTSNode(current_state)
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    if stats is not None:
+        stats.visit(0)
+
+    count = 0
+    while (count < iterations if deadline is None
+           else perf_counter() < deadline):
+        count += 1
+        node = root
+        depth = 0
+
+        # Select a state to explore, then expand one of its untried moves.
+        while node.untried_moves == [] and node.children != []:
+            node = node.select_child(exploration)
+            depth += 1
+        if node.untried_moves != []:
+            move = node.untried_moves.pop(
+                rng.randrange(len(node.untried_moves)))
+            child = MCTSNode(node.value.make_move(move), move, node)
+            node.children.append(child)
+            if stats is not None:
+                if node.untried_moves == []:
+                    stats.expand(len(node.children))
+                stats.visit(depth + 1)
+                if child.terminal_score is not None:
+                    stats.terminals += 1
+            node = child
+            depth += 1
+
+        if node.terminal_score is not None:
+            score = node.terminal_score
+        elif playout == 'rough':
+            score = node.value.rough_outcome()
+        else:
+            score = random_playout(node.value, rng, stats, depth,
+                                   max_playout_moves)
+
+        # Each node records its score for the player who moved into it.
+        while node is not None:
+            score *= -1
+            node.visits += 1
+            node.total_score += score
+            node = node.parent
+
+    best_child = None
+    for child in root.children:
+        if best_child is None or child.visits > best_child.visits:
+            best_child = child
+    if best_child is None:
+        moves = current_state.get_possible_moves()
+        return moves[0] if moves else None
+    return best_child.move
+
+
+def random_playout(state: Any, rng: Random,
+                   stats: Optional['SearchStats'] = None,
+                   depth: int = 0, max_moves: int = 200) -> int:
+    """
+    Return the score for the current player of state at the end of a game
+    played from state with moves chosen at random by rng, counting the
+    states played through in stats, if it is given, as further from the
+    current state than state's depth moves.
+
+    A game not over after max_moves moves is stopped and scored as a draw.
+
+    >>> from chopsticks import Chopsticks
+    >>> random_playout(Chopsticks(True).current_state, Random(0),
+    ...                max_moves=0)
+    0
+    """
+    sign = 1
+    moves_made = 0
+    while not state.is_terminal():
+        if moves_made == max_moves:
+            return state.DRAW
+        moves_made += 1
+        moves = state.get_possible_moves()
+        state = state.make_move(moves[rng.randrange(len(moves))])
+        sign *= -1
+        depth += 1
+        if stats is not None:
+            stats.visit(depth)
+    if stats is not None and depth > 0:
+        stats.terminals += 1
+    return sign * state.terminal_score()
+
+
+@timed
+def parallel_minimax_strategy(game: Any, max_workers: Optional[int] = None,
+                              split_depth: int = 1,
+                              stats: Optional['SearchStats'] = None) -> Any:
+    """
+    Return a move for a game generated using the minimax strategy, searching
+    every state split_depth moves from the current state in a separate
+    process, with at most max_workers processes (one per core by default).
+
+    The move returned is the same one recursive_minimax_strategy would return.
+    The worker processes are only sent states. The states searched, in every
+    process, are counted in stats, if it is given, along with the time taken.
+    """
+    current_state = game.current_state
+    jobs = {}
+    root_moves = [(move, split_subtree(current_state.make_move(move),
+                                       split_depth - 1, jobs))
+                  for move in current_state.get_possible_moves()]
+    keys = list(jobs)
+    with ProcessPoolExecutor(max_workers) as executor:
+        results = list(executor.map(state_minimax_score,
+                                    [jobs[key] for key in keys]))
+    job_scores = {key: score for key, (score, _) in zip(keys, results)}
+    if stats is not None:
+        # The workers searched at the same time as each other, within the
+        # time already being counted here, and from split_depth moves in.
+        for _, job_stats in results:
+            job_stats.seconds = 0.0
+            job_stats.max_depth += split_depth - 1
+            stats.merge(job_stats)
+
+    initial_moves = {1: [], -1: [], 0: []}
+    for move, subtree in root_moves:
+        initial_moves[-1 * subtree_score(subtree, job_scores)].append(move)
+    if initial_moves[1] != []:
+        return initial_moves[1][0]
+    elif initial_moves[0] != []:
+        return initial_moves[0][0]
+    return initial_moves[-1][0] if initial_moves[-1] != [] else None
+
+
+def split_subtree(state: Any, depth: int, jobs: Dict[Any, Any]) -> tuple:
+    """
+    Return the game tree from state down to the states depth moves away,
+    adding each of those states to jobs under its state_key().
+
+    The tree is a tuple ('score', score) for a state which is over,
+    ('job', key) for a state in jobs, or ('node', subtrees) for a state whose
+    moves lead to subtrees.
+    """
+    if state.is_terminal():
+        return 'score', state.terminal_score()
+    elif depth <= 0:
+        key = state.state_key()
+        jobs[key] = state
+        return 'job', key
+    return 'node', [split_subtree(state.make_move(move), depth - 1, jobs)
+                    for move in state.get_possible_moves()]
+
+
+def subtree_score(subtree: tuple, job_scores: Dict[Any, int]) -> int:
+    """
+    Return the score of the state at the root of subtree for its current
+    player, given the scores of the states in job_scores.
+    """
+    kind, value = subtree
+    if kind == 'score':
+        return value
+    elif kind == 'job':
+        return job_scores[value]
+    return max([subtree_score(child, job_scores) * -1 for child in value])
+
+
+def state_minimax_score(state: Any) -> Tuple[int, 'SearchStats']:
+    """
+    Return the score of state for its current player, and the stats of the
+    search which found it, searched with the module-level
+    TRANSPOSITION_TABLE so that it can be run in another process.
+    """
+    stats = SearchStats()
+    score = alpha_beta_helper(state, -1, 1, TRANSPOSITION_TABLE, stats)
+    return score, stats
+
+
+class SearchStats:
+    """
+    Counts of the work a search has done, which a strategy adds to when
+    given one.
+
+    nodes - the number of states searched
+    expanded - the number of states whose moves were searched
+    children - the number of moves searched from those states
+    terminals - the number of states searched where the game was over
+    max_depth - the most moves from the current state a searched state was
+    table_hits - the number of states whose score was found in a
+                 transposition table
+    cutoffs - the number of states whose remaining moves were not searched
+              since a move already searched was good enough
+    first_move_cutoffs - the number of those cutoffs made by the first move
+                         searched
+    seconds - the wall time spent searching
+    """
+    nodes: int
+    expanded: int
+    children: int
+    terminals: int
+    max_depth: int
+    table_hits: int
+    cutoffs: int
+    first_move_cutoffs: int
+    seconds: float
+
+    def __init__(self) -> None:
+        """
+        Initialize a new SearchStats with nothing counted.
+
+        >>> SearchStats().nodes
+        0
+        """
+        self.nodes = 0
+        self.expanded = 0
+        self.children = 0
+        self.terminals = 0
+        self.max_depth = 0
+        self.table_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.seconds = 0.0
+
+    def __str__(self) -> str:
+        """
+        Return a one line summary of these counts.
+
+        >>> stats = SearchStats()
+        >>> stats.visit(2)
+        >>> stats.expand(3)
+        >>> print(stats)
+        1 nodes (1 expanded, 0 terminal), depth 2, branching 3.00, \
+0 table hits, 0 cutoffs (0% first move), 0.000s
+        """
+        return "{} nodes ({} expanded, {} terminal), depth {}, branching " \
+               "{:.2f}, {} table hits, {} cutoffs ({:.0%} first move), " \
+               "{:.3f}s".format(
+                   self.nodes, self.expanded, self.terminals, self.max_depth,
+                   self.branching_factor(), self.table_hits, self.cutoffs,
+                   self.first_move_cutoff_rate(), self.seconds)
+
+    def visit(self, depth: int) -> None:
+        """
+        Count a state searched depth moves from the current state.
+        """
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def expand(self, moves: int) -> None:
+        """
+        Count a state whose moves moves were searched.
+        """
+        self.expanded += 1
+        self.children += moves
+
+    def cutoff(self, index: int) -> None:
+        """
+        Count a cutoff made by the move at position index in the order the
+        moves were searched.
+        """
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Return the fraction of cutoffs made by the first move searched, which
+        is higher the better moves are ordered.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def branching_factor(self) -> float:
+        """
+        Return the mean number of moves searched from each state whose moves
+        were searched.
+        """
+        return self.children / self.expanded if self.expanded else 0.0
+
+    def merge(self, other: 'SearchStats') -> None:
+        """
+        Add the counts of other, e.g. from another process, to these.
+        """
+        self.nodes += other.nodes
+        self.expanded += other.expanded
+        self.children += other.children
+        self.terminals += other.terminals
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.table_hits += other.table_hits
+        self.cutoffs += other.cutoffs
+        self.first_move_cutoffs += other.first_move_cutoffs
+        self.seconds += other.seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return these counts as a dictionary which can be written as JSON.
+        """
+        return {'nodes': self.nodes, 'expanded': self.expanded,
+                'terminals': self.terminals, 'max_depth': self.max_depth,
+                'branching_factor': self.branching_factor(),
+                'table_hits': self.table_hits, 'cutoffs': self.cutoffs,
+                'first_move_cutoff_rate': self.first_move_cutoff_rate(),
+                'seconds': self.seconds}
+
+
+class SearchTimeout(Exception):
+    """
+    Raised by a search which has run out of time.
+    """
+    pass
+
+
+class TranspositionTable:
+    """
+    A bounded cache of search results, keyed on GameState.canonical_key(),
+    so that states equivalent under a symmetry of the board share an entry,
+    or on GameState.zobrist_key() if canonical is False, together with the
+    state's class, since different games' keys can be equal.
+
+    Entries must be the same for states equivalent under a symmetry (e.g.
+    scores, but not moves) unless canonical is False.
+
+    Once the table holds max_entries entries, storing a new entry evicts the
+    least recently used one.
+
+    max_entries - the most entries this table will hold
+    canonical - whether states are keyed on their canonical_key()
+    hits - the number of lookups which found an entry
+    misses - the number of lookups which did not find an entry
+    """
+    max_entries: int
+    canonical: bool
+    hits: int
+    misses: int
+
+    def __init__(self, max_entries: int = 1000000,
+                 canonical: bool = True) -> None:
+        """
+        Initialize a new, empty TranspositionTable holding at most
+        max_entries entries, keyed on canonical keys if canonical is True.
+
+        >>> table = TranspositionTable(10)
+        >>> len(table)
+        0
+        """
+        self.max_entries = max_entries
+        self.canonical = canonical
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _key(self, state: Any) -> Tuple[type, int]:
+        """
+        Return the key of state in this TranspositionTable.
+        """
+        if self.canonical:
+            return type(state), state.canonical_key()
+        return type(state), state.zobrist_key()
+
+    def __len__(self) -> int:
+        """
+        Return the number of entries in this TranspositionTable.
+        """
+        return len(self._entries)
+
+    def lookup(self, state: Any) -> Any:
+        """
+        Return the entry stored for state, or None if there is none.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> table = TranspositionTable()
+        >>> table.lookup(SubtractSquareState(True, 4)) is None
+        True
+        >>> table.store(SubtractSquareState(True, 4), 1)
+        >>> table.lookup(SubtractSquareState(True, 4))
+        1
+        >>> table.hits, table.misses
+        (1, 1)
+        """
+        key = self._key(state)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, state: Any, entry: Any) -> None:
+        """
+        Store entry for state, evicting the least recently used entry if this
+        TranspositionTable is full.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> table = TranspositionTable(1)
+        >>> table.store(SubtractSquareState(True, 4), 1)
+        >>> table.store(SubtractSquareState(True, 2), -1)
+        >>> len(table)
+        1
+        >>> table.lookup(SubtractSquareState(True, 4)) is None
+        True
+        """
+        key = self._key(state)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every entry from this TranspositionTable and reset its hit and
+        miss counts.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# The table shared by the minimax strategies when none is given to them.
+TRANSPOSITION_TABLE = TranspositionTable()
+
+
+class MoveOrdering:
+    """
+    A ranking of the moves of each state searched by alpha-beta, so that
+    the moves most likely to cause a cutoff are searched first. Moves are
+    ranked by, in turn:
+
+        - whether the move was the best one found for the state by an
+          earlier search
+        - the state's move_prior() of the move, a cheap static guess
+        - whether the move is a killer move at the state's ply: one of the
+          last moves to cause a cutoff in another state that many moves
+          from the current state
+        - the move's history: how often, and how near the root, it has
+          caused cutoffs anywhere
+
+    and otherwise keep the order get_possible_moves() gives them in.
+
+    Best moves are kept by GameState.zobrist_key() rather than in a
+    TranspositionTable, since a move made in one state is not the same move
+    in the states equivalent to it under a symmetry of the board.
+
+    max_entries - the most best moves kept before all are forgotten
+    killers_per_ply - the number of killer moves kept at each ply
+    best_moves - the best move found for each state, by zobrist_key()
+    killers - the killer moves at each ply, most recent first
+    history - the history of each move which has caused a cutoff
+    """
+    max_entries: int
+    killers_per_ply: int
+    best_moves: Dict[int, Any]
+    killers: Dict[int, List[Any]]
+    history: Dict[Any, int]
+
+    def __init__(self, max_entries: int = 1000000,
+                 killers_per_ply: int = 2) -> None:
+        """
+        Initialize a new MoveOrdering which knows nothing about any moves.
+        """
+        self.max_entries = max_entries
+        self.killers_per_ply = killers_per_ply
+        self.best_moves = {}
+        self.killers = {}
+        self.history = {}
+
+    def order(self, state: Any, moves: List[Any], ply: int) -> List[Any]:
+        """
+        Return moves, the moves of state, which is ply moves from the current
+        state, best ranked first.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> ordering = MoveOrdering()
+        >>> state = SubtractSquareState(True, 10)
+        >>> ordering.record_cutoff(4, 1, 3)
+        >>> ordering.order(state, [1, 4, 9], 1)
+        [4, 1, 9]
+        >>> ordering.record_best(state, 9)
+        >>> ordering.order(state, [1, 4, 9], 1)
+        [9, 4, 1]
+        """
+        best_move = self.best_moves.get(state.zobrist_key())
+        killers = self.killers.get(ply, [])
+        history = self.history
+        return sorted(moves, key=lambda move: (
+            move == best_move, state.move_prior(move), move in killers,
+            history.get(move, 0)), reverse=True)
+
+    def record_cutoff(self, move: Any, ply: int, moves: int) -> None:
+        """
+        Record that move caused a cutoff at a state ply moves from the
+        current state, with moves moves.
+
+        Cutoffs in states with more moves left, which save more searching,
+        add more to a move's history.
+        """
+        killers = self.killers.setdefault(ply, [])
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.killers_per_ply:]
+        self.history[move] = self.history.get(move, 0) + moves * moves
+
+    def record_best(self, state: Any, move: Any) -> None:
+        """
+        Record that move was the best move found for state.
+        """
+        if len(self.best_moves) >= self.max_entries:
+            self.best_moves.clear()
+        self.best_moves[state.zobrist_key()] = move
+
+    def clear(self) -> None:
+        """
+        Forget everything recorded about every move.
+        """
+        self.best_moves.clear()
+        self.killers.clear()
+        self.history.clear()
 
 
 class PotentialState:
     """
     A class to represent a potential state of a game based on if a move was
-    made, and its children of the same data structure.
+    made, and its children of the same data structure, depth moves from the
+    state searched from.
     """
-    def __init__(self, value: Any, children=None, score=None):
+    __slots__ = ('value', 'children', 'score', 'depth')
+
+    def __init__(self, value: Any, children=None, score=None, depth=0):
         """
         Initialize a new potential state of a game to keep track of its
         children, which are the states of the game made with each possible
@@ -172,11 +1292,67 @@ class PotentialState:
         self.value = value
         self.children = children[:] if children is not None else []
         self.score = score
+        self.depth = depth
+
+
+class MCTSNode:
+    """
+    A state explored by Monte Carlo Tree Search.
+
+    value - the state of the game
+    move - the move which led to value, or None at the root
+    parent - the MCTSNode move was made from, or None at the root
+    children - the MCTSNodes of the moves explored from value
+    untried_moves - the moves from value which have not been explored
+    visits - the number of playouts made through this node
+    total_score - the sum of those playouts' scores for the player who made
+                  move
+    terminal_score - the score of value for its current player if the game
+                     is over at value, otherwise None
+    """
+    __slots__ = ('value', 'move', 'parent', 'children', 'untried_moves',
+                 'visits', 'total_score', 'terminal_score')
+
+    def __init__(self, value: Any, move: Any = None,
+                 parent: Optional['MCTSNode'] = None) -> None:
+        """
+        Initialize a new, unvisited node for state value, reached by making
+        move from parent.
+        """
+        self.value = value
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        self.total_score = 0.0
+        self.terminal_score = None
+        if value.is_terminal():
+            self.untried_moves = []
+            self.terminal_score = value.terminal_score()
+        else:
+            self.untried_moves = value.get_possible_moves()
+
+    def select_child(self, exploration: float) -> 'MCTSNode':
+        """
+        Return the child of this node with the highest UCT value, weighing
+        unexplored children by exploration.
+        """
+        log_visits = log(self.visits)
+        best_child = None
+        best_value = None
+        for child in self.children:
+            value = (child.total_score / child.visits
+                     + exploration * sqrt(log_visits / child.visits))
+            if best_value is None or value > best_value:
+                best_child = child
+                best_value = value
+        return best_child
 
 
 class Stack:
     """ Last-in, first-out (LIFO) stack.
     """
+    __slots__ = ('_contains',)
 
     def __init__(self) -> None:
         """ Create a new, empty Stack self.
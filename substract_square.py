@@ -1,8 +1,9 @@
 """
 Module for substract square game
 """
+from math import isqrt
 from typing import List, Any
-from game import CurrentState
+from game_state import GameState
 
 
 class SubstractSquare:
@@ -60,12 +61,11 @@ class SubstractSquare:
         return int(move)
 
     def is_over(self, other)->bool:
-        """Return a boolean stating if the game is over.
+        """Return a boolean stating if the game is over, which is when there
+        is nothing left to subtract from, without listing the moves left.
         """
 
-        if other.get_possible_moves() == []:
-            return True
-        return False
+        return other.value < 1
 
     def is_winner(self, player: str) ->bool:
         """"Return a boolean showing whether the current player is the winner
@@ -78,7 +78,7 @@ class SubstractSquare:
             return False
 
 
-class SubstractSquareState(CurrentState):
+class SubstractSquareState(GameState):
     """ Initialize a game state of the subtract square game.
     ===Attributes===
     get_current_player_name: return a string representing the current player
@@ -101,6 +101,20 @@ class SubstractSquareState(CurrentState):
         self.player_one_turn = is_p1_turn
         self.value = value
 
+    @property
+    def player_one_turn(self) -> bool:
+        """Return whether it is player one's turn, the same as p1_turn.
+        """
+
+        return self.p1_turn
+
+    @player_one_turn.setter
+    def player_one_turn(self, is_p1_turn: bool) -> None:
+        """Set whether it is player one's turn.
+        """
+
+        self.p1_turn = is_p1_turn
+
     def __str__(self):
         """Return a string representation of the current state of the game.
         >>> s = SubstractSquareState(True, 2)
@@ -122,11 +136,9 @@ class SubstractSquareState(CurrentState):
         the current state of the game.
         """
 
-        possible_moves = []
-        for i in range(1, self.value + 1):
-            if i ** 0.5 == int(i ** 0.5):
-                possible_moves.append(i)
-        return possible_moves
+        if self.value < 1:
+            return []
+        return [i * i for i in range(1, isqrt(self.value) + 1)]
 
     def make_move(self, move_to_make: int):
         """Apply a move on the game, and create a new current state of the game.
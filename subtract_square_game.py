@@ -12,15 +12,19 @@ class SubtractSquareGame(Game):
     Abstract class for a game to be played with two players.
     """
 
-    def __init__(self, p1_starts):
+    def __init__(self, p1_starts, count=None):
         """
         Initialize this Game, using p1_starts to find who the first player is.
 
         :param p1_starts: A boolean representing whether Player 1 is the first
                           to make a move.
         :type p1_starts: bool
+        :param count: The number to subtract from. The user is asked for it
+                      if it is not given.
+        :type count: int
         """
-        count = int(input("Enter the number to subtract from: "))
+        if count is None:
+            count = int(input("Enter the number to subtract from: "))
         self.current_state = SubtractSquareState(p1_starts, count)
 
     def get_instructions(self):
@@ -34,29 +38,6 @@ class SubtractSquareGame(Game):
             " the starting number. The winner is the person who subtracts to 0."
         return instructions
 
-    def is_over(self, state):
-        """
-        Return whether or not this game is over.
-
-        :return: True if the game is over, False otherwise.
-        :rtype: bool
-        """
-        return state.current_total == 0
-
-    def is_winner(self, player):
-        """
-        Return whether player has won the game.
-
-        Precondition: player is 'p1' or 'p2'.
-
-        :param player: The player to check.
-        :type player: str
-        :return: Whether player has won or not.
-        :rtype: bool
-        """
-        return (self.current_state.get_current_player_name() != player
-                and self.is_over(self.current_state))
-
     def str_to_move(self, string):
         """
         Return the move that string represents. If string is not a move,
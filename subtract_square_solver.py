@@ -0,0 +1,203 @@
+"""
+A retrograde solver for SubtractSquare, which finds whether each total is a
+win or a loss for the player to move, and a strategy which plays by looking
+totals up in the resulting table.
+
+Run this module to solve a table and write it to disk, where get_table()
+maps it into memory instead of solving it again:
+
+    python subtract_square_solver.py [--directory DIRECTORY] [LIMIT]
+
+NOTE: You do not have to run python-ta on this file.
+"""
+import argparse
+import os
+from math import isqrt
+from typing import Any, List, Optional
+import numpy as np
+from strategy import fallback_search, timed, SearchStats
+from subtract_square_state import SubtractSquareState
+
+# The length in bytes of the header of a saved table, which holds its limit.
+HEADER_SIZE = 8
+
+# The largest total covered by the table main() saves unless told otherwise.
+DEFAULT_LIMIT = 10 ** 7
+
+# The directory get_table() looks for a saved table in.
+DEFAULT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+class SubtractSquareTable:
+    """
+    Whether each total from 0 to limit is a win for the player to move in
+    SubtractSquare, stored as a bitset with one bit per total.
+
+    limit - the largest total this table covers
+    """
+    limit: int
+
+    def __init__(self, limit: int, bits: Optional[Any] = None) -> None:
+        """
+        Initialize a table of the totals from 0 to limit, solving them unless
+        bits, the packed bits of a table already solved, is given.
+
+        >>> table = SubtractSquareTable(10)
+        >>> [total for total in range(11) if not table.is_win(total)]
+        [0, 2, 5, 7, 10]
+        """
+        self.limit = limit
+        if bits is None:
+            bits = np.packbits(solve_wins(limit), bitorder='little')
+        self._bits = bits
+        self._squares = np.arange(1, isqrt(limit) + 1, dtype=np.int64) ** 2
+
+    def is_win(self, total: int) -> bool:
+        """
+        Return whether the player to move at total can force a win.
+
+        Precondition: 0 <= total <= self.limit
+        """
+        return bool(self._bits[total >> 3] >> (total & 7) & 1)
+
+    def winning_move(self, total: int) -> Optional[int]:
+        """
+        Return the smallest square which leaves the other player at a losing
+        total, or None if total is itself losing.
+
+        Only one bit is stored per total, so the move is found by checking
+        the totals each square up to total leaves, which takes O(sqrt(total))
+        time.
+
+        >>> SubtractSquareTable(20).winning_move(9)
+        4
+        >>> SubtractSquareTable(20).winning_move(10) is None
+        True
+
+        Precondition: 0 <= total <= self.limit
+        """
+        squares = self._squares[:isqrt(total)]
+        remaining = total - squares
+        won = self._bits[remaining >> 3] >> (remaining & 7) & 1
+        losing = np.flatnonzero(won == 0)
+        if len(losing) == 0:
+            return None
+        return int(squares[losing[0]])
+
+    def save(self, path: str) -> None:
+        """
+        Write this table to the file at path: its limit as an 8 byte
+        little-endian integer, followed by its packed bits.
+        """
+        with open(path, 'wb') as table_file:
+            table_file.write(self.limit.to_bytes(HEADER_SIZE, 'little'))
+            table_file.write(self._bits.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'SubtractSquareTable':
+        """
+        Return the table saved in the file at path, whose bits are mapped
+        into memory rather than read.
+        """
+        with open(path, 'rb') as table_file:
+            limit = int.from_bytes(table_file.read(HEADER_SIZE), 'little')
+        bits = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE,
+                         shape=(limit // 8 + 1,))
+        return cls(limit, bits)
+
+
+def solve_wins(limit: int) -> Any:
+    """
+    Return a NumPy boolean array of whether each total from 0 to limit is a
+    win for the player to move.
+
+    The totals are swept in increasing order. The smallest total not yet
+    marked as a win is a loss, since every total a square below it is a
+    win; every total a square above it is then marked as a win.
+
+    >>> solve_wins(7).tolist()
+    [False, True, False, True, True, False, True, False]
+    """
+    wins = np.zeros(limit + 1, dtype=bool)
+    squares = np.arange(1, isqrt(limit) + 1, dtype=np.int64) ** 2
+    total = 0
+    while total <= limit:
+        wins[total + squares[:isqrt(limit - total)]] = True
+        # argmin stops at the first total which is not yet a win.
+        following = wins[total + 1:]
+        step = int(np.argmin(following)) if len(following) else 0
+        if len(following) == 0 or following[step]:
+            break
+        total += step + 1
+    return wins
+
+
+def table_path(directory: str = DEFAULT_DIRECTORY) -> str:
+    """
+    Return the path of the saved table in directory.
+    """
+    return os.path.join(directory, 'subtract_square.table')
+
+
+_TABLE = None
+
+
+def get_table(total: int) -> SubtractSquareTable:
+    """
+    Return a table covering total.
+
+    A table saved in DEFAULT_DIRECTORY is mapped into memory the first time
+    a table is asked for. A table is solved again (covering at least twice
+    as many totals) when a larger total than it covers is asked for.
+    """
+    global _TABLE
+    if _TABLE is None and os.path.exists(table_path()):
+        _TABLE = SubtractSquareTable.load(table_path())
+    if _TABLE is None or _TABLE.limit < total:
+        limit = max(total, 2 * _TABLE.limit if _TABLE is not None else 1024)
+        _TABLE = SubtractSquareTable(limit)
+    return _TABLE
+
+
+@timed
+def table_strategy(game: Any, stats: Optional[SearchStats] = None) -> Any:
+    """
+    Return a move for game by looking up the smallest square which leaves
+    the other player at a losing total, or subtracting 1 if there is none,
+    if game is SubtractSquare, otherwise by alpha_beta_strategy.
+
+    A move looked up is counted in stats, if it is given, as a table hit.
+    """
+    state = game.current_state
+    if isinstance(state, SubtractSquareState):
+        total = state.current_total
+        move = get_table(total).winning_move(total)
+        if stats is not None:
+            stats.visit(0)
+            stats.table_hits += 1
+        return 1 if move is None else move
+    return fallback_search(game, stats)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Solve the table of the totals up to the limit in the command line
+    arguments argv, and save it where get_table() looks for it.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve SubtractSquare up to a total and save the results.")
+    parser.add_argument('limit', type=int, nargs='?', default=DEFAULT_LIMIT)
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY,
+                        help="the directory to save the table in")
+    args = parser.parse_args(argv)
+    if args.limit < 0:
+        parser.error("the limit must not be negative")
+
+    path = table_path(args.directory)
+    SubtractSquareTable(args.limit).save(path)
+    print("Totals up to {}: {} bytes, written to {}".format(
+        args.limit, os.path.getsize(path), path))
+
+
+if __name__ == '__main__':
+    main()
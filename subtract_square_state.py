@@ -3,7 +3,9 @@ An implementation of a state for SubtractSquare.
 
 NOTE: You do not have to run python-ta on this file.
 """
-from typing import Any
+from itertools import islice
+from math import isqrt
+from typing import Any, Iterator, List, Optional
 from game_state import GameState
 
 
@@ -11,6 +13,10 @@ class SubtractSquareState(GameState):
     """
     The state of a game at a certain point in time.
     """
+    current_total: int
+    _history: Optional[List[int]]
+
+    __slots__ = ('current_total', '_history')
 
     def __init__(self, is_p1_turn: bool, current_total: int) -> None:
         """
@@ -19,6 +25,7 @@ class SubtractSquareState(GameState):
         """
         super().__init__(is_p1_turn)
         self.current_total = current_total
+        self._history = None
 
     def __str__(self) -> str:
         """
@@ -30,12 +37,22 @@ class SubtractSquareState(GameState):
         """
         Return all possible moves that can be applied to this state.
         """
-        moves = []
-        for i in range(1, self.current_total + 1):
-            if i ** 2 <= self.current_total:
-                moves.append(i ** 2)
+        return squares_up_to(self.current_total)
+
+    def iter_possible_moves(self) -> Iterator[int]:
+        """
+        Yield the moves get_possible_moves() returns, in the same order,
+        without building a list of them.
+        """
+        return iter_squares_up_to(self.current_total)
 
-        return moves
+    def is_valid_move(self, move: Any) -> bool:
+        """
+        Return whether move is a positive square no larger than the current
+        total.
+        """
+        return isinstance(move, int) and move <= self.current_total and \
+            is_pos_square(move)
 
     def make_move(self, move: Any) -> "SubtractSquareState":
         """
@@ -48,6 +65,50 @@ class SubtractSquareState(GameState):
                                         self.current_total - move)
         return new_state
 
+    def apply_move(self, move: Any) -> None:
+        """
+        Apply move to this state itself, so that it can be taken back with
+        undo_move().
+
+        >>> state = SubtractSquareState(True, 10)
+        >>> state.apply_move(9)
+        >>> state.current_total, state.p1_turn
+        (1, False)
+        >>> state.undo_move()
+        >>> state.current_total, state.p1_turn
+        (10, True)
+        """
+        if type(move) == str:
+            move = int(move)
+        if self._history is None:
+            self._history = []
+        self._history.append(move)
+        self.current_total -= move
+        self.p1_turn = not self.p1_turn
+
+    def undo_move(self) -> None:
+        """
+        Take back the last move applied with apply_move() which has not been
+        taken back yet.
+        """
+        self.current_total += self._history.pop()
+        self.p1_turn = not self.p1_turn
+
+    def is_terminal(self) -> bool:
+        """
+        Return whether the game is over at this state.
+        """
+        return self.current_total == 0
+
+    def terminal_score(self) -> int:
+        """
+        Return the score of the current player at this state, which has lost
+        since the other player subtracted to 0.
+
+        Precondition: self.is_terminal()
+        """
+        return self.LOSE
+
     def __repr__(self) -> str:
         """
         Return a representation of this state (which can be used for
@@ -56,6 +117,18 @@ class SubtractSquareState(GameState):
         return "P1's Turn: {} - Total: {}".format(self.p1_turn,
                                                   self.current_total)
 
+    def state_key(self) -> Any:
+        """
+        Return a hashable key which identifies this state.
+        """
+        return self.p1_turn, self.current_total
+
+    def zobrist_key(self) -> int:
+        """
+        Return an integer which identifies this state.
+        """
+        return self.current_total * 2 + self.p1_turn
+
     def rough_outcome(self) -> float:
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
@@ -63,9 +136,9 @@ class SubtractSquareState(GameState):
         """
         if is_pos_square(self.current_total):
             return self.WIN
-        elif all([is_pos_square(self.current_total - n ** 2)
-                  for n in range(1, self.current_total + 1)
-                  if n ** 2 < self.current_total]):
+        elif all(is_pos_square(self.current_total - square)
+                 for square in self.iter_possible_moves()
+                 if square < self.current_total):
             return self.LOSE
 
         return self.DRAW
@@ -79,8 +152,56 @@ def is_pos_square(n: int) -> bool:
     False
     >>> is_pos_square(9)
     True
+    >>> is_pos_square(2 ** 54 + 1)
+    False
+    """
+    return 0 < n and isqrt(n) ** 2 == n
+
+
+# The squares of 0, 1, 2, ... which have been needed so far, up to the
+# square of _MAX_CACHED_ROOT.
+_SQUARES = [0]
+_MAX_CACHED_ROOT = 2 ** 16
+
+
+def _square_root(n: int) -> int:
+    """
+    Return the integer square root of n, or 0 if n is negative, caching the
+    squares up to it.
+    """
+    root = isqrt(n) if n > 0 else 0
+    for i in range(len(_SQUARES), min(root, _MAX_CACHED_ROOT) + 1):
+        _SQUARES.append(i * i)
+    return root
+
+
+def iter_squares_up_to(n: int) -> Iterator[int]:
+    """
+    Yield the positive squares no larger than n, in increasing order.
+
+    >>> list(iter_squares_up_to(20))
+    [1, 4, 9, 16]
+    """
+    root = _square_root(n)
+    yield from islice(_SQUARES, 1, root + 1)
+    for i in range(len(_SQUARES), root + 1):
+        yield i * i
+
+
+def squares_up_to(n: int) -> List[int]:
+    """
+    Return a new list of the positive squares no larger than n, in
+    increasing order.
+
+    >>> squares_up_to(0)
+    []
+    >>> squares_up_to(10)
+    [1, 4, 9]
     """
-    return 0 < n and (round(n ** 0.5) ** 2 == n)
+    root = _square_root(n)
+    squares = _SQUARES[1:root + 1]
+    squares.extend(i * i for i in range(len(_SQUARES), root + 1))
+    return squares
 
 
 if __name__ == "__main__":
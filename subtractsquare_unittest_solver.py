@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+
+import subtract_square_solver
+from game_interface import playable_games, usable_strategies
+from strategy import alpha_beta_strategy, recursive_minimax_strategy, \
+    recursive_helper, SearchStats, TranspositionTable
+from subtract_square_solver import SubtractSquareTable, get_table, main, \
+    solve_wins, table_strategy
+SubtractSquareGame = playable_games['s']
+StonehengeGame = playable_games['h']
+
+
+class SubtractSquareSolverUnitTests(unittest.TestCase):
+    def test_solve_wins_matches_minimax(self):
+        """
+        Test that the solved table agrees with minimax on small totals.
+        """
+        wins = solve_wins(60)
+        table = TranspositionTable()
+        for total in range(61):
+            with patch('builtins.input', return_value=str(total)):
+                game = SubtractSquareGame(True)
+            score = recursive_helper(game, game.current_state, table)
+            self.assertEqual(wins[total], score == 1,
+                             "The table and minimax disagree on whether " +
+                             "{} is a win.".format(total))
+
+    def test_save_and_load(self):
+        """
+        Test that a saved table loads with the same limit and results.
+        """
+        table = SubtractSquareTable(1000)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'subtract_square.bin')
+            table.save(path)
+            self.assertEqual(os.path.getsize(path), 8 + 1000 // 8 + 1)
+            loaded = SubtractSquareTable.load(path)
+            self.assertEqual(loaded.limit, 1000)
+            for total in range(1001):
+                self.assertEqual(loaded.is_win(total), table.is_win(total))
+            del loaded
+
+    @patch('builtins.input', side_effect=['9'])
+    def test_table_strategy(self, input):
+        """
+        Test that table_strategy picks the same winning move as minimax, and
+        a valid move from a losing total.
+        """
+        game = SubtractSquareGame(True)
+        self.assertEqual(table_strategy(game),
+                         recursive_minimax_strategy(game))
+        game.current_state = game.current_state.make_move(
+            table_strategy(game))
+        self.assertTrue(game.current_state.is_valid_move(
+            table_strategy(game)))
+
+    @patch('builtins.input', side_effect=['50'])
+    def test_table_strategy_stats(self, input):
+        """
+        Test that table_strategy counts a lookup as one node and one table
+        hit, is registered as 'st', and searches for other games.
+        """
+        game = SubtractSquareGame(True)
+        stats = SearchStats()
+        move = table_strategy(game, stats=stats)
+        self.assertEqual((stats.nodes, stats.table_hits), (1, 1))
+        self.assertEqual(usable_strategies['st'](game), move)
+
+        game = StonehengeGame(True, 1)
+        self.assertEqual(table_strategy(game),
+                         alpha_beta_strategy(game, TranspositionTable()))
+
+    def test_get_table_loads_saved_table(self):
+        """
+        Test that main() saves a table which get_table() maps into memory
+        rather than solving, until a larger total is asked for.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'subtract_square.table')
+            with patch('sys.stdout'):
+                main(['5000', '--directory', directory])
+            with patch.object(subtract_square_solver, 'table_path',
+                              return_value=path), \
+                    patch.object(subtract_square_solver, '_TABLE', None):
+                table = get_table(100)
+                self.assertEqual(table.limit, 5000)
+                self.assertIsInstance(table._bits, np.memmap)
+                self.assertIs(get_table(5000), table)
+                self.assertEqual(get_table(5001).limit, 10000)
+            del table
+
+    def test_table_strategy_large_total(self):
+        """
+        Test that table_strategy answers a total in the millions with a
+        move leaving the other player at a losing total.
+        """
+        with patch('builtins.input', return_value='2000000'):
+            game = SubtractSquareGame(True)
+        table = SubtractSquareTable(2000000)
+        move = table_strategy(game)
+        self.assertTrue(game.current_state.is_valid_move(move))
+        if table.is_win(2000000):
+            self.assertFalse(table.is_win(2000000 - move))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import re
 
 # Import the student solution
 from game_interface import playable_games
+from substract_square import SubstractSquare, SubstractSquareState
 SubtractSquareGame = playable_games['s']
 
 SUBTRACT_SQUARE_FORMAT = ".*(?<=[^0-9])([0-9]+)"
@@ -337,6 +338,105 @@ class SubtractSquareUnitTests(unittest.TestCase):
                           "Square with a value of 20) should return a move " +
                           "that is of the same type as a valid move."))
 
+    @patch('builtins.input', side_effect=['1'])
+    def test_terminal_score(self, input):
+        """
+        Test is_terminal() and terminal_score() on the state reached when p1
+        subtracts to 0.
+        """
+        game = SubtractSquareGame(True)
+        state = game.current_state
+        self.assertFalse(state.is_terminal())
+        state = state.make_move(game.str_to_move("1"))
+        self.assertTrue(state.is_terminal())
+        self.assertEqual(state.terminal_score(), state.LOSE)
+
+    @patch('builtins.input', side_effect=[str(2 ** 60 + 3)])
+    def test_possible_moves_large_total(self, input):
+        """
+        Test iter_possible_moves() and is_valid_move() on a total too large
+        for floating point square roots to be exact.
+        """
+        game = SubtractSquareGame(True)
+        state = game.current_state
+        self.assertEqual(list(zip(range(3), state.iter_possible_moves())),
+                         [(0, 1), (1, 4), (2, 9)])
+        self.assertTrue(state.is_valid_move(2 ** 60))
+        self.assertFalse(state.is_valid_move((2 ** 30 + 1) ** 2))
+        self.assertFalse(state.is_valid_move(2 ** 60 + 1))
+
+    @patch('builtins.input', side_effect=[str(10 ** 12)])
+    def test_get_possible_moves_large_total(self, input):
+        """
+        Test that get_possible_moves() and iter_possible_moves() give every
+        square up to a large total, in the same order.
+        """
+        game = SubtractSquareGame(True)
+        moves = game.current_state.get_possible_moves()
+        self.assertEqual(len(moves), 10 ** 6)
+        self.assertEqual(moves[:3], [1, 4, 9])
+        self.assertEqual(moves[-1], 10 ** 12)
+        self.assertEqual(moves, list(game.current_state.iter_possible_moves()))
+
+    @patch('builtins.input', side_effect=['20'])
+    def test_apply_undo_move(self, input):
+        """
+        Test that applying moves to a state in place gives the same states as
+        make_move, and that undoing them gives back the states before.
+        """
+        game = SubtractSquareGame(True)
+        state = game.current_state
+        expected = [state.make_move(16)]
+        expected.append(expected[-1].make_move(4))
+        state.apply_move(16)
+        self.assertEqual(state, expected[0])
+        state.apply_move('4')
+        self.assertEqual(state, expected[1])
+        self.assertTrue(state.is_terminal())
+        state.undo_move()
+        self.assertEqual(state, expected[0])
+        state.undo_move()
+        self.assertEqual(repr(state), "P1's Turn: True - Total: 20")
+
+
+class SubstractSquareLegacyUnitTests(unittest.TestCase):
+    """
+    Tests of the legacy SubstractSquare game in substract_square.py, which
+    game_interface does not use.
+    """
+
+    def test_get_possible_moves(self):
+        """
+        Test that get_possible_moves() gives every square up to the value,
+        in increasing order, and none for a value of 0.
+        """
+        for value in range(200):
+            state = SubstractSquareState(True, value)
+            self.assertEqual(state.get_possible_moves(),
+                             [i for i in range(1, value + 1)
+                              if round(i ** 0.5) ** 2 == i])
+
+    @patch('builtins.input', side_effect=['10'])
+    def test_play_to_end(self, input):
+        """
+        Test that moves change the value and the player, that is_over() is
+        only True once the value reaches 0, and that the player who moved
+        last is the winner.
+        """
+        game = SubstractSquare(True)
+        self.assertFalse(game.is_over(game.current_state))
+        self.assertFalse(game.is_winner('p1'))
+        state = game.current_state.make_move(9)
+        self.assertEqual((state.value, state.get_current_player_name()),
+                         (1, 'p2'))
+        self.assertFalse(game.is_over(state))
+        self.assertFalse(state.is_valid_move(4))
+        game.current_state = state.make_move(1)
+        self.assertTrue(game.is_over(game.current_state))
+        self.assertEqual(game.current_state.get_possible_moves(), [])
+        self.assertTrue(game.is_winner('p2'))
+        self.assertFalse(game.is_winner('p1'))
+
 
 if __name__ == "__main__":
     unittest.main()